@@ -35,6 +35,12 @@ class NoSampleSheetDataFoundException(MetadataException):
         self.message = f"No data could be parsed from {samplesheet_path}"
 
 
+class StreamingExportException(MetadataException):
+    def __init__(self, element: str) -> None:
+        self.message = f"The enclosing XML of {element} differs between its children and can " \
+                       f"not be streamed"
+
+
 class SomethingNotRecognizedException(MetadataException):
     thing: ClassVar[str] = "Needle"
     things: ClassVar[str] = "needles"
@@ -1,7 +1,20 @@
 
+import contextlib
+import contextvars
 import logging
 from functools import wraps
-from typing import ClassVar, Tuple, Type, TypeVar, Optional
+from typing import (
+    Callable,
+    ClassVar,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Tuple,
+    Type,
+    TypeVar,
+    Optional,
+)
 
 from snpseq_metadata.models.ngi_models import (
     NGIMetadataModel,
@@ -46,6 +59,12 @@ from snpseq_metadata.exceptions import (
 
 LOG = logging.getLogger(__name__)
 T = TypeVar("T", bound="Converter")
+F = TypeVar("F")
+
+# the flyweight cache of the conversion in progress in the current context, if any
+_flyweights: "contextvars.ContextVar[Optional[Dict[Hashable, object]]]" = (
+    contextvars.ContextVar("flyweights", default=None)
+)
 
 
 # These exceptions are defined here, since this class will know about the different model systems
@@ -97,12 +116,134 @@ class Converter:
 
     Example:
         sra_library_instance = Converter.ngi_to_sra(ngi_library_instance)
+
+    The converter subclasses are registered with the Converter.register decorator, which indexes
+    them by the model classes they convert from. Converter.ngi_to_sra and Converter.lims_to_ngi
+    look up the converters for the exact type of the supplied model and its registered base
+    classes, closest first, and fall through to the next converter if one does not produce a
+    model.
+
+    Reference models (e.g. study refs, sample descriptors and platforms) are typically identical
+    for many of the objects converted in one go. During a conversion, these are built once and
+    shared through a flyweight cache, see Converter.flyweight. The shared objects must therefore
+    be treated as immutable.
     """
 
     ngi_model_class: ClassVar[Type] = NGIMetadataModel
     sra_model_class: ClassVar[Type] = SRAMetadataModel
     lims_model_class: ClassVar[Type] = LIMSMetadataModel
 
+    # the registered converters, by the model class they convert from
+    _ngi_converters: ClassVar[Dict[Type, List[Type["Converter"]]]] = {}
+    _lims_converters: ClassVar[Dict[Type, List[Type["Converter"]]]] = {}
+    # the converters resolved for model types, including the ones found via a base class
+    _resolved_converters: ClassVar[
+        Dict[Tuple[str, Type], Tuple[Type["Converter"], ...]]
+    ] = {}
+
+    @staticmethod
+    def register(converter_cls: Type[T]) -> Type[T]:
+        """
+        Class decorator registering a converter subclass as the converter for its
+        ngi_model_class and, if the subclass declares one itself, its lims_model_class. If
+        several converters convert from the same model class (e.g. LIMSSample), the entry points
+        try them in the order they were registered.
+
+        :param converter_cls: the converter subclass to register
+        :return: the converter subclass
+        """
+        for attr, registry in (
+            ("ngi_model_class", Converter._ngi_converters),
+            ("lims_model_class", Converter._lims_converters),
+        ):
+            if attr in vars(converter_cls):
+                registry.setdefault(getattr(converter_cls, attr), []).append(converter_cls)
+        Converter._resolved_converters.clear()
+        return converter_cls
+
+    @staticmethod
+    def converters_for(
+        registry: str, model_type: Type
+    ) -> Tuple[Type["Converter"], ...]:
+        """
+        Get the registered converters for a model type, i.e. the converters registered for the
+        type itself followed by the ones registered for its base classes, closest first. The
+        result is cached per type.
+
+        :param registry: the registry to look in, "ngi" or "lims"
+        :param model_type: the type of the model to convert
+        :return: a tuple of converter subclasses, empty if no converter has been registered
+        """
+        key = (registry, model_type)
+        try:
+            return Converter._resolved_converters[key]
+        except KeyError:
+            converters = (
+                Converter._ngi_converters
+                if registry == "ngi"
+                else Converter._lims_converters
+            )
+            resolved = tuple(
+                converter
+                for tp in model_type.__mro__
+                for converter in converters.get(tp, [])
+            )
+            Converter._resolved_converters[key] = resolved
+            return resolved
+
+    @staticmethod
+    def converter_for(registry: str, model_type: Type) -> Optional[Type["Converter"]]:
+        """
+        Get the first of the registered converters for a model type, see
+        Converter.converters_for.
+
+        :param registry: the registry to look in, "ngi" or "lims"
+        :param model_type: the type of the model to convert
+        :return: the converter subclass or None if no converter has been registered
+        """
+        converters = Converter.converters_for(registry, model_type)
+        return converters[0] if converters else None
+
+    @staticmethod
+    @contextlib.contextmanager
+    def flyweight_cache() -> Iterator[Dict[Hashable, object]]:
+        """
+        Context manager providing the flyweight cache for a conversion. If a conversion is
+        already in progress in the current context, its cache is re-used, otherwise a new cache
+        is created and discarded when the outermost conversion exits.
+
+        :return: the flyweight cache, a dict
+        """
+        cache = _flyweights.get()
+        if cache is not None:
+            yield cache
+            return
+        token = _flyweights.set({})
+        try:
+            yield _flyweights.get()
+        finally:
+            _flyweights.reset(token)
+
+    @classmethod
+    def flyweight(cls: Type[T], key: Hashable, factory: Callable[[], F]) -> F:
+        """
+        Get the object for the supplied key from the flyweight cache of the conversion in
+        progress, creating it with the factory if it is not in the cache. If no conversion is in
+        progress, a new object is always created.
+
+        :param key: the key identifying the object, will be combined with the converter class
+        :param factory: a callable creating the object
+        :return: the shared object
+        """
+        cache = _flyweights.get()
+        if cache is None:
+            return factory()
+        cache_key = (cls, key)
+        obj = cache.get(cache_key)
+        if obj is None:
+            obj = cache[cache_key] = factory()
+        return obj
+
     @classmethod
     @catch_exception
     def ngi_to_sra(
@@ -110,19 +251,33 @@ class Converter:
     ) -> Optional[sra_model_class]:
         """
         Entry point to convert a NGI model class to a corresponding SRA model class. The method will
-        iterate over subclasses to locate a subclass whose ngi_model_class matches the supplied
-        ngi_model.
+        try the registered subclasses whose ngi_model_class matches the supplied ngi_model until
+        one of them returns a converted model.
 
         :param ngi_model: an instance of NGIMetadataModel or any of its subclasses
         :return: an instance of a subclass of SRAMetadataModel, corresponding to the supplied
         ngi_model or None if no matching conversion could be made
         """
-        # iterate over all subclasses to find one whose ngi_nodel_class variable matches the
-        # supplied ngi_model, but only if this is called in the base class
+        # look up the subclasses whose ngi_nodel_class variable matches the supplied ngi_model,
+        # but only if this is called in the base class
         if cls == Converter:
-            for subclass in cls.__subclasses__():
-                if isinstance(ngi_model, subclass.ngi_model_class):
-                    sra_model = subclass.ngi_to_sra(ngi_model=ngi_model)
+            converters = cls.converters_for("ngi", type(ngi_model))
+            if not converters:
+                raise SRAModelConversionException(
+                    source=type(ngi_model),
+                    target=cls.sra_model_class,
+                    reason=LookupError(
+                        f"no converter has been registered for {type(ngi_model).__name__}"
+                    ),
+                )
+            # nested conversions are already using the cache of the outermost conversion
+            with (
+                contextlib.nullcontext()
+                if _flyweights.get() is not None
+                else cls.flyweight_cache()
+            ):
+                for converter in converters:
+                    sra_model = converter.ngi_to_sra(ngi_model=ngi_model)
                     if sra_model:
                         return sra_model
             # conversion was unsuccessful, raise the exception
@@ -138,21 +293,29 @@ class Converter:
     ) -> Optional[ngi_model_class]:
         """
         Entry point to convert a LIMS model class to a corresponding NGI model class. The method
-        will iterate over subclasses to locate a subclass whose lims_model_class matches the
-        supplied lims_model.
+        will try the registered subclasses whose lims_model_class matches the supplied lims_model
+        until one of them returns a converted model.
 
         :param lims_model: an instance of LIMSMetadataModel or any of its subclasses
         :return: an instance of a subclass of NGIMetadataModel, corresponding to the supplied
         lims_model or None if no matching conversion could be made
         """
-        # iterate over all subclasses to find one whose lims_nodel_class variable matches the
-        # supplied lims_model, but only if this is called in the base class
+        # look up the subclasses whose lims_nodel_class variable matches the supplied
+        # lims_model, but only if this is called in the base class
         if cls == Converter:
-            for subclass in cls.__subclasses__():
-                if isinstance(lims_model, subclass.lims_model_class):
-                    ngi_model = subclass.lims_to_ngi(lims_model=lims_model)
-                    if ngi_model:
-                        return ngi_model
+            converters = cls.converters_for("lims", type(lims_model))
+            if not converters:
+                raise NGIModelConversionException(
+                    source=type(lims_model),
+                    target=cls.ngi_model_class,
+                    reason=LookupError(
+                        f"no converter has been registered for {type(lims_model).__name__}"
+                    ),
+                )
+            for converter in converters:
+                ngi_model = converter.lims_to_ngi(lims_model=lims_model)
+                if ngi_model:
+                    return ngi_model
             # conversion was unsuccessful, raise the exception
             raise NGIModelConversionException(
                 source=type(lims_model),
@@ -160,6 +323,7 @@ class Converter:
             )
 
 
+@Converter.register
 class ConvertSampleDescriptor(Converter):
     """
     Conversion between NGISampleDescriptor, SRASampleDescriptor and LIMSSample
@@ -175,7 +339,10 @@ class ConvertSampleDescriptor(Converter):
         cls: Type[T], ngi_model: ngi_model_class
     ) -> Optional[sra_model_class]:
         if ngi_model:
-            return cls.sra_model_class.create_object(refname=ngi_model.sample_id)
+            return cls.flyweight(
+                ngi_model.sample_id,
+                lambda: cls.sra_model_class.create_object(refname=ngi_model.sample_id),
+            )
 
     @classmethod
     @catch_exception
@@ -186,6 +353,7 @@ class ConvertSampleDescriptor(Converter):
             return cls.ngi_model_class(sample_id=lims_model.sample_id)
 
 
+@Converter.register
 class ConvertStudyRef(Converter):
     """
     Conversion between NGIStudyRef, SRAStudyRef and LIMSSample
@@ -201,7 +369,10 @@ class ConvertStudyRef(Converter):
         cls: Type[T], ngi_model: ngi_model_class
     ) -> Optional[sra_model_class]:
         if ngi_model:
-            return cls.sra_model_class.create_object(refname=ngi_model.project_id)
+            return cls.flyweight(
+                ngi_model.project_id,
+                lambda: cls.sra_model_class.create_object(refname=ngi_model.project_id),
+            )
 
     @classmethod
     @catch_exception
@@ -212,6 +383,7 @@ class ConvertStudyRef(Converter):
             return cls.ngi_model_class(project_id=lims_model.project_id)
 
 
+@Converter.register
 class ConvertRun(Converter):
     """
     Conversion between NGIRun and SRARun
@@ -237,6 +409,7 @@ class ConvertRun(Converter):
             )
 
 
+@Converter.register
 class ConvertSequencingPlatform(Converter):
     """
     Conversion between NGIIlluminaSequencingPlatform, SRAIlluminaSequencingPlatform and LIMSSample
@@ -252,7 +425,12 @@ class ConvertSequencingPlatform(Converter):
         cls: Type[T], ngi_model: ngi_model_class
     ) -> Optional[sra_model_class]:
         if ngi_model:
-            return cls.sra_model_class.create_object(model_name=ngi_model.model_name)
+            return cls.flyweight(
+                ngi_model.model_name,
+                lambda: cls.sra_model_class.create_object(
+                    model_name=ngi_model.model_name
+                ),
+            )
 
     @classmethod
     @catch_exception
@@ -268,6 +446,7 @@ class ConvertSequencingPlatform(Converter):
                 raise InstrumentModelNotRecognizedException(needle="None")
 
 
+@Converter.register
 class ConvertRunSet(Converter):
     """
     Conversion between NGIFlowcell and SRARunSet
@@ -287,6 +466,7 @@ class ConvertRunSet(Converter):
             )
 
 
+@Converter.register
 class ConvertResultFile(Converter):
     """
     Conversion between NGIResultFile and SRAResultFile
@@ -309,6 +489,7 @@ class ConvertResultFile(Converter):
             )
 
 
+@Converter.register
 class ConvertExperimentRef(Converter):
     """
     Conversion between NGIExperimentRef, SRAExperimentRef and LIMSSample
@@ -324,7 +505,10 @@ class ConvertExperimentRef(Converter):
         cls: Type[T], ngi_model: ngi_model_class
     ) -> Optional[sra_model_class]:
         if ngi_model:
-            return cls.sra_model_class.create_object(experiment_name=ngi_model.alias)
+            return cls.flyweight(
+                ngi_model.alias,
+                lambda: cls.sra_model_class.create_object(experiment_name=ngi_model.alias),
+            )
 
     @classmethod
     @catch_exception
@@ -339,6 +523,7 @@ class ConvertExperimentRef(Converter):
             return cls.ngi_model_class(alias=alias, sample=sample, project=project)
 
 
+@Converter.register
 class ConvertExperimentSet(Converter):
     """
     Conversion between NGIExperimentSet, SRAExperimentSet and LIMSSequencingContainer
@@ -380,6 +565,7 @@ class ConvertExperimentSet(Converter):
             return cls.ngi_model_class(experiments=experiments)
 
 
+@Converter.register
 class ConvertLibrary(Converter):
     """
     Conversion between NGILibrary, SRALibrary and LIMSSample
@@ -467,6 +653,7 @@ class ConvertLibrary(Converter):
         )
 
 
+@Converter.register
 class ConvertExperiment(Converter):
     """
     Conversion between NGIExperiment, SRAExperiment and LIMSSample
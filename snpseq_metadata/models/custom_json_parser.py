@@ -1,11 +1,15 @@
-
-from typing import Any, Dict, Iterable, Type
+import dataclasses
+import functools
+import warnings
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Iterable, List, Tuple, Type
 
 from xsdata.formats.bindings import T
 from xsdata.formats.dataclass.parsers import JsonParser
-from xsdata.exceptions import ParserError
+from xsdata.exceptions import ConverterWarning, ParserError
 
 
+@dataclass
 class CustomJsonParser(JsonParser):
     """
     This extends the default JsonParser in order to override the scoring method used for finding
@@ -15,7 +19,16 @@ class CustomJsonParser(JsonParser):
 
     This version does not score empty lists and includes the proportion of assigned attributes for
     a dataclass in the scoring.
+
+    The candidate classes for a combination of union and data keys are worked out once and re-used,
+    together with the part of the score that only depends on the keys. The candidates are still
+    bound and scored for each object, since the best candidate can depend on the values of the
+    data.
     """
+    candidate_cache: Dict[
+        Tuple[FrozenSet[Type], FrozenSet[str]], List[Tuple[Type, float]]
+    ] = field(default_factory=dict, init=False, repr=False, compare=False)
+
     @staticmethod
     def score_object(obj: Any) -> float:
         """
@@ -41,29 +54,74 @@ class CustomJsonParser(JsonParser):
 
         return sum(score(getattr(obj, var)) for var in obj.__dict__.keys())
 
-    def bind_best_dataclass(self, data: Dict, classes: Iterable[Type[T]]) -> T:
-        """Attempt to bind the given data to one possible models, if more than
-        one is successful return the object with the highest score."""
-        obj = None
-        keys = set(data.keys())
-        max_score = -1.0
+    def bind(self, data: Dict, clazz: Type[T]) -> T:
+        """
+        Bind a data dict (or a list of data dicts) directly to a model dataclass, without
+        serializing the data to a json string first.
+
+        :param data: the data dict to bind
+        :param clazz: the model dataclass to bind the data to
+        :return: an instance of the model dataclass
+        """
+        tp = self.verify_type(clazz, data)
+        with warnings.catch_warnings():
+            if self.config.fail_on_converter_warnings:
+                warnings.filterwarnings("error", category=ConverterWarning)
+            try:
+                if not isinstance(data, list):
+                    return self.bind_dataclass(data, tp)
+                return [self.bind_dataclass(obj, tp) for obj in data]
+            except ConverterWarning as e:
+                raise ParserError(e)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def model_fields(clazz: Type[T]) -> FrozenSet[str]:
+        return frozenset(field.name for field in dataclasses.fields(clazz))
+
+    def candidate_classes(
+        self, classes: FrozenSet[Type[T]], keys: FrozenSet[str]
+    ) -> List[Tuple[Type[T], float]]:
+        """
+        Get the classes that data with the supplied keys could be bound to, in the order they
+        should be tried, together with the part of the score based on how well the keys match
+        the fields of the class.
+
+        :param classes: the classes to choose from
+        :param keys: the keys of the data
+        :return: a list of (class, score) tuples
+        """
+        cache_key = (classes, keys)
+        if cache_key in self.candidate_cache:
+            return self.candidate_cache[cache_key]
+
+        candidates = []
         for clazz in sorted(classes, key=lambda x: x.__name__):
 
             if not self.context.class_type.is_model(clazz):
                 continue
 
             if self.context.local_names_match(keys, clazz):
-                candidate = self.bind_optional_dataclass(data, clazz)
-                score = self.score_object(candidate)
-                params = set(clazz().__dict__.keys())
-
-                score += len(keys.intersection(params)) / len(params)
+                params = self.model_fields(clazz)
+                score = len(keys.intersection(params)) / len(params)
                 score -= len(keys.difference(params))
-                if score > max_score:
-                    max_score = score
-                    obj = candidate
+                candidates.append((clazz, score))
+        self.candidate_cache[cache_key] = candidates
+        return candidates
+
+    def bind_best_dataclass(self, data: Dict, classes: Iterable[Type[T]]) -> T:
+        """Attempt to bind the given data to one possible models, if more than
+        one is successful return the object with the highest score."""
+        obj = None
+        max_score = -1.0
+        classes = frozenset(classes)
+        for clazz, key_score in self.candidate_classes(classes, frozenset(data.keys())):
+            candidate = self.bind_optional_dataclass(data, clazz)
+            score = self.score_object(candidate) + key_score
+            if score > max_score:
+                max_score = score
+                obj = candidate
 
-        print(f"\n{data}\n\t{obj}\n\t{classes}\n")
         if obj:
             return obj
 
@@ -1,11 +1,13 @@
-import json
-from typing import Dict, Generic, Optional, Tuple, TypeVar, Type
+import dataclasses
+import functools
+from typing import Dict, Generic, Optional, TextIO, Tuple, TypeVar, Type, Union
 
 from xsdata.formats.dataclass.serializers.json import JsonSerializer, DictFactory
 from xsdata.formats.dataclass.serializers.xml import XmlSerializer
 from xsdata.formats.dataclass.serializers.config import SerializerConfig
 from xsdata.formats.dataclass.context import XmlContext
 
+from snpseq_metadata.exceptions import StreamingExportException
 from snpseq_metadata.models.custom_json_parser import CustomJsonParser
 from snpseq_metadata.utilities import log_exception
 
@@ -24,20 +26,60 @@ class ModelExporter(Generic[T]):
             if v is not None and (type(v) is not list or len(v) > 0)
         }
 
+    # the number of distinct (format, entity, meta name, xml declaration) combinations for
+    # which serializers are kept, there is only a handful of these in practice
+    serializer_cache_size = 64
+
     @classmethod
     def serializer_config_context(
             cls: Type[ME],
             obj_entity: Optional[str] = None,
             meta_name: Optional[str] = None,
             xml_declaration: Optional[bool] = True) -> Tuple[SerializerConfig, XmlContext]:
-        context = XmlContext(
-            element_name_generator=lambda x: obj_entity or meta_name or x.upper())
+        context = cls.serializer_context(obj_entity=obj_entity, meta_name=meta_name)
         config = SerializerConfig(
             pretty_print=True,
             ignore_default_attributes=True,
             xml_declaration=xml_declaration)
         return config, context
 
+    @staticmethod
+    @functools.lru_cache(maxsize=serializer_cache_size)
+    def serializer_context(
+            obj_entity: Optional[str] = None,
+            meta_name: Optional[str] = None) -> XmlContext:
+        # the context caches the metadata of the dataclasses it has seen, so a context is
+        # created once per element naming and shared by all serializers using that naming
+        return XmlContext(
+            element_name_generator=lambda x: obj_entity or meta_name or x.upper())
+
+    @classmethod
+    def serializer(
+            cls: Type[ME],
+            obj_entity: Optional[str] = None,
+            meta_name: Optional[str] = None,
+            xml_declaration: Optional[bool] = True,
+            format: str = "xml") -> Union[JsonSerializer, XmlSerializer]:
+        return cls._serializer(obj_entity, meta_name, xml_declaration, format)
+
+    @classmethod
+    @functools.lru_cache(maxsize=serializer_cache_size)
+    def _serializer(
+            cls: Type[ME],
+            obj_entity: Optional[str],
+            meta_name: Optional[str],
+            xml_declaration: Optional[bool],
+            format: str) -> Union[JsonSerializer, XmlSerializer]:
+        config, context = cls.serializer_config_context(
+            obj_entity=obj_entity,
+            meta_name=meta_name,
+            xml_declaration=xml_declaration)
+        if format == "json":
+            # pretty_print in the config gives an indentation of 2 when writing json
+            return JsonSerializer(
+                context=context, dict_factory=cls.filter_none_empty, config=config)
+        return XmlSerializer(context=context, config=config)
+
     @classmethod
     @log_exception
     def to_json(
@@ -46,13 +88,29 @@ class ModelExporter(Generic[T]):
             obj_entity: Optional[str] = None,
             meta_name: Optional[str] = None,
             xml_declaration: Optional[bool] = True) -> Dict:
-        config, context = cls.serializer_config_context(
+        # convert the dataclass tree directly to a dict instead of rendering and parsing json
+        serializer = cls.serializer(
             obj_entity=obj_entity,
             meta_name=meta_name,
-            xml_declaration=xml_declaration)
-        serializer = JsonSerializer(
-            context=context, indent=2, dict_factory=cls.filter_none_empty, config=config)
-        return json.loads(serializer.render(obj))
+            xml_declaration=xml_declaration,
+            format="json")
+        return serializer.convert(obj)
+
+    @classmethod
+    @log_exception
+    def write_json(
+            cls: Type[ME],
+            obj: T,
+            fh: TextIO,
+            obj_entity: Optional[str] = None,
+            meta_name: Optional[str] = None,
+            xml_declaration: Optional[bool] = True) -> None:
+        serializer = cls.serializer(
+            obj_entity=obj_entity,
+            meta_name=meta_name,
+            xml_declaration=xml_declaration,
+            format="json")
+        serializer.write(fh, obj)
 
     @classmethod
     @log_exception
@@ -62,18 +120,78 @@ class ModelExporter(Generic[T]):
             obj_entity: Optional[str] = None,
             meta_name: Optional[str] = None,
             xml_declaration: Optional[bool] = True) -> str:
-        config, context = cls.serializer_config_context(
+        serializer = cls.serializer(
             obj_entity=obj_entity,
             meta_name=meta_name,
-            xml_declaration=xml_declaration)
-        serializer = XmlSerializer(context=context, config=config)
+            xml_declaration=xml_declaration,
+            format="xml")
         return serializer.render(obj)
 
+    @classmethod
+    @log_exception
+    def write_xml(
+            cls: Type[ME],
+            obj: T,
+            fh: TextIO,
+            children_field: Optional[str] = None,
+            obj_entity: Optional[str] = None,
+            meta_name: Optional[str] = None,
+            xml_declaration: Optional[bool] = True) -> None:
+        """
+        Write the xml representation of an object to a file handle. If children_field names a
+        list field on the object, the children in the list are rendered and written one at a
+        time, so that only a single child is held in memory as xml. The output is identical to
+        the output of to_xml.
+
+        :param obj: the object to export
+        :param fh: a file handle to write the xml to
+        :param children_field: the name of the list field on the object whose elements should
+        be written one at a time
+        :return: None
+        """
+        serializer = cls.serializer(
+            obj_entity=obj_entity,
+            meta_name=meta_name,
+            xml_declaration=xml_declaration,
+            format="xml")
+        children = getattr(obj, children_field) if children_field else None
+        if not children:
+            fh.write(serializer.render(obj))
+            return
+
+        header = footer = None
+        for child in children:
+            # render the enclosing element with this child only and strip off the enclosing
+            # start and end tags
+            xml = serializer.render(dataclasses.replace(obj, **{children_field: [child]}))
+            if header is None:
+                header, footer = cls._enclosing_xml(xml)
+                fh.write(header)
+            if not (xml.startswith(header) and xml.endswith(footer)):
+                raise StreamingExportException(element=type(obj).__name__)
+            fh.write(xml[len(header):len(xml) - len(footer)])
+        fh.write(footer)
+
+    @staticmethod
+    def _enclosing_xml(xml: str) -> Tuple[str, str]:
+        # with pretty printing, the xml declaration and the start and end tags of the
+        # enclosing element are written on separate lines
+        start = xml.index("\n") + 1 if xml.startswith("<?xml") else 0
+        header_end = xml.index("\n", start) + 1
+        footer_start = xml.rstrip("\n").rindex("\n") + 1
+        return xml[:header_end], xml[footer_start:]
+
 
 class ModelImporter:
 
     @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def parser() -> CustomJsonParser:
+        # the parser, and the metadata its context collects about the dataclasses, is shared
+        # by all imports
+        return CustomJsonParser(context=XmlContext())
+
+    @classmethod
     @log_exception
-    def from_json(json_obj: Dict, model_cls: Type[T]) -> T:
-        parser = CustomJsonParser(context=XmlContext())
-        return parser.from_string(json.dumps(json_obj), model_cls)
+    def from_json(cls, json_obj: Dict, model_cls: Type[T]) -> T:
+        return cls.parser().bind(json_obj, model_cls)
@@ -1,19 +1,110 @@
-from typing import Dict, TypeVar, Type, Union, Iterable
+from types import MappingProxyType
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Mapping,
+    Tuple,
+    TypeVar,
+    Type,
+    Union,
+)
 import datetime
+import functools
 
 from snpseq_metadata.exceptions import SomethingNotRecognizedException
 
 M = TypeVar("M", bound="MetadataModel")
 T = TypeVar("T")
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+# marker for slots that have not been assigned a value
+_UNSET = object()
 
 
 class MetadataModel:
+    # subclasses can declare __slots__ to do without a per-instance __dict__, the attributes in
+    # the slots are then treated the same way as the attributes in __dict__
+    __slots__ = ()
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _public_slot_names(cls) -> Tuple[str, ...]:
+        """
+        Get the names of the public slots declared by the class and its bases, in declaration
+        order and starting with the base classes.
+        """
+        return tuple(
+            name
+            for klass in reversed(cls.__mro__)
+            for name in klass.__dict__.get("__slots__", ())
+            if not name.startswith("_")
+        )
+
+    def _public_attributes(self) -> Dict[str, Any]:
+        """
+        Get the public instance attributes that are set, from the slots as well as from the
+        instance __dict__, if any. Private attributes, i.e. names starting with "_", are runtime
+        state and not part of the model.
+        """
+        attributes = {}
+        for name in self._public_slot_names():
+            value = getattr(self, name, _UNSET)
+            if value is not _UNSET:
+                attributes[name] = value
+        for name, value in getattr(self, "__dict__", {}).items():
+            if not name.startswith("_"):
+                attributes[name] = value
+        return attributes
+
+    def _cached_index(
+        self, name: str, items: Callable[[], Iterable[Tuple[K, V]]]
+    ) -> Mapping[K, V]:
+        """
+        Get an index (e.g. of child models by alias) that is built the first time it is needed
+        and re-used after that. If several items have the same key, the first one is used.
+
+        The index is cached until invalidate_indexes is called. The models call it themselves
+        when the children the index is built from are replaced or added through their methods
+        and properties, but it must be called explicitly if the children are modified in any
+        other way.
+
+        Subclasses using this must be able to store the _index_cache attribute, i.e. include it
+        in their __slots__ if they declare any.
+
+        :param name: the name of the index
+        :param items: a callable returning the (key, item) pairs to index
+        :return: a read-only view of the index
+        """
+        index_cache = getattr(self, "_index_cache", None)
+        if index_cache is None:
+            index_cache = self._index_cache = {}
+        if name not in index_cache:
+            index = {}
+            for key, item in items():
+                index.setdefault(key, item)
+            index_cache[name] = MappingProxyType(index)
+        return index_cache[name]
+
+    def invalidate_indexes(self) -> None:
+        """
+        Drop the cached indexes of the model, so that they are rebuilt when next needed. This is
+        done by the model itself when its children are replaced or added through its methods and
+        properties, but must be called explicitly after modifying them in any other way (e.g.
+        replacing an item in a list of children in place or changing the alias of a child).
+        """
+        self._index_cache = None
+
     def __eq__(self, other: object) -> bool:
         return type(other) is type(self) and all(
             map(
                 lambda k: getattr(other, k, None) == getattr(self, k, None),
                 filter(
-                    lambda k: k not in ["model_object", "exporter"], vars(self).keys()
+                    lambda k: k not in ["model_object", "exporter"],
+                    self._public_attributes().keys(),
                 ),
             )
         )
@@ -24,7 +115,7 @@ class MetadataModel:
 
     def to_json(self) -> Dict:
         json_obj = {}
-        for name, value in vars(self).items():
+        for name, value in self._public_attributes().items():
             if value is not None:
                 json_obj[name] = self._item_to_json(value)
         return json_obj
@@ -1,4 +1,4 @@
-from typing import Dict, List, Type, TypeVar, Optional
+from typing import Dict, List, Mapping, Type, TypeVar, Optional, Tuple
 
 from snpseq_metadata.models.ngi_models.sequencing_platform import (
     NGIIlluminaSequencingPlatform,
@@ -15,6 +15,8 @@ TS = TypeVar("TS", bound="NGIExperimentSet")
 
 
 class NGIExperimentBase(NGIMetadataModel):
+    __slots__ = ("alias", "project")
+
     def __init__(self, alias: str, project: NGIStudyRef) -> None:
         self.alias = alias
         self.project = project
@@ -27,12 +29,10 @@ class NGIExperimentBase(NGIMetadataModel):
             return NGIExperiment.from_json(json_obj=json_obj)
 
     def is_reference_to(self, other: T) -> bool:
-        return all(
-            [
-                isinstance(self, NGIExperimentRef),
-                isinstance(other, NGIExperiment),
-                self.alias == other.alias,
-            ]
+        return (
+            isinstance(self, NGIExperimentRef)
+            and isinstance(other, NGIExperiment)
+            and self.alias == other.alias
         )
 
     def get_reference(self) -> TR:
@@ -40,19 +40,29 @@ class NGIExperimentBase(NGIMetadataModel):
 
 
 class NGIExperimentRef(NGIExperimentBase):
+    __slots__ = ("sample",)
+
     def __init__(
         self, alias: str, project: NGIStudyRef, sample: NGISampleDescriptor
     ) -> None:
         super().__init__(alias, project)
         self.sample = sample
 
+    def __hash__(self) -> int:
+        return hash((type(self), self.alias, self.project, self.sample))
+
+    @staticmethod
+    def ids_from_samplesheet_row(samplesheet_row: Dict) -> Tuple[str, str]:
+        project_id = samplesheet_row.get("sample_project")
+        sample_id = samplesheet_row.get("sample_id")
+        sample_name = samplesheet_row.get("sample_name", sample_id)
+        return project_id, sample_name
+
     @classmethod
     def from_samplesheet_row(
         cls: Type[TR], samplesheet_row: Dict, platform: NGIIlluminaSequencingPlatform
     ) -> TR:
-        project_id = samplesheet_row.get("sample_project")
-        sample_id = samplesheet_row.get("sample_id")
-        sample_name = samplesheet_row.get("sample_name", sample_id)
+        project_id, sample_name = cls.ids_from_samplesheet_row(samplesheet_row)
         alias = f"{project_id}-{sample_name}-{platform.model_name}"
         return cls(
             alias=alias,
@@ -73,6 +83,8 @@ class NGIExperimentRef(NGIExperimentBase):
 
 
 class NGIExperiment(NGIExperimentBase):
+    __slots__ = ("title", "platform", "library")
+
     def __init__(
         self,
         alias: str,
@@ -108,9 +120,29 @@ class NGIExperiment(NGIExperimentBase):
 
 
 class NGIExperimentSet(NGIMetadataModel):
+    __slots__ = ("_experiments", "_index_cache")
+
     def __init__(self, experiments: List[NGIExperiment]) -> None:
         self.experiments = experiments
 
+    @property
+    def experiments(self) -> List[NGIExperiment]:
+        return self._experiments
+
+    @experiments.setter
+    def experiments(self, experiments: List[NGIExperiment]) -> None:
+        self._experiments = experiments
+        self.invalidate_indexes()
+
+    def __eq__(self, other: object) -> bool:
+        return super().__eq__(other) and other.experiments == self.experiments
+
+    def to_json(self) -> Dict:
+        json_obj = super().to_json()
+        if self.experiments is not None:
+            json_obj["experiments"] = self._item_to_json(self.experiments)
+        return json_obj
+
     @classmethod
     def from_json(cls: Type[TS], json_obj: Dict) -> TS:
         experiments = [
@@ -121,11 +153,20 @@ class NGIExperimentSet(NGIMetadataModel):
     def get_experiment_for_reference(
         self, experiment_ref: NGIExperimentRef
     ) -> Optional[NGIExperiment]:
-        try:
-            return next(
-                filter(
-                    lambda exp: experiment_ref.is_reference_to(exp), self.experiments
-                )
-            )
-        except StopIteration:
-            pass
+        if isinstance(experiment_ref, NGIExperimentRef):
+            return self.experiments_by_alias().get(experiment_ref.alias)
+
+    def experiments_by_alias(self) -> Mapping[str, NGIExperiment]:
+        """
+        Get the index of the experiments in the set by alias, see MetadataModel._cached_index.
+
+        :return: a read-only mapping with aliases as keys and experiments as values
+        """
+        return self._cached_index(
+            "experiments_by_alias",
+            lambda: (
+                (experiment.alias, experiment)
+                for experiment in self.experiments or []
+                if isinstance(experiment, NGIExperiment)
+            ),
+        )
@@ -1,20 +1,35 @@
 import os
 
-from typing import Dict, TypeVar, Type
+from typing import Dict, Optional, TypeVar, Type
 
 from snpseq_metadata.models.ngi_models.metadata_model import NGIMetadataModel
+from snpseq_metadata.utilities import normalize_checksum_method
 
 T = TypeVar("T", bound="NGIResultFile")
 
 
 class NGIResultFile(NGIMetadataModel):
+    __slots__ = (
+        "filepath",
+        "filetype",
+        "checksum",
+        "checksum_method",
+        "extra_checksums",
+    )
+
     def __init__(
-        self, filepath: str, filetype: str, checksum: str, checksum_method: str = "MD5"
+        self,
+        filepath: str,
+        filetype: str,
+        checksum: str,
+        checksum_method: str = "MD5",
+        extra_checksums: Optional[Dict[str, str]] = None,
     ) -> None:
         self.filepath = filepath
-        self.filetype = filetype
+        self.filetype = self._intern(filetype)
         self.checksum = checksum
-        self.checksum_method = checksum_method
+        self.checksum_method = self._intern(checksum_method)
+        self.extra_checksums = extra_checksums
 
     def __eq__(self, other: T) -> bool:
         return (
@@ -22,6 +37,7 @@ class NGIResultFile(NGIMetadataModel):
             and self.filetype == other.filetype
             and self.checksum == other.checksum
             and self.checksum_method == other.checksum_method
+            and self.extra_checksums == other.extra_checksums
         )
 
     @classmethod
@@ -31,20 +47,52 @@ class NGIResultFile(NGIMetadataModel):
             filetype=json_obj.get("filetype"),
             checksum=json_obj.get("checksum"),
             checksum_method=json_obj.get("checksum_method"),
+            extra_checksums=json_obj.get("extra_checksums"),
         )
 
+    def is_primary_checksum_method(self, method: str) -> bool:
+        return self.checksum_method is not None and normalize_checksum_method(
+            method
+        ) == normalize_checksum_method(self.checksum_method)
+
+    def get_checksum(self, method: str) -> Optional[str]:
+        """
+        Get the checksum calculated with the specified method, which can be either the primary
+        checksum method of the file or one of the methods in extra_checksums.
+        """
+        if self.is_primary_checksum_method(method):
+            return self.checksum
+        return (self.extra_checksums or {}).get(normalize_checksum_method(method))
+
+    def set_checksum(self, method: str, checksum: str) -> None:
+        """
+        Set the checksum calculated with the specified method. If the file has neither a
+        checksum nor a checksum method, the method becomes the primary checksum method.
+        """
+        if self.checksum_method is None and self.checksum is None:
+            self.checksum_method = self._intern(method)
+        if self.is_primary_checksum_method(method):
+            self.checksum = checksum
+        else:
+            self.extra_checksums = self.extra_checksums or {}
+            self.extra_checksums[normalize_checksum_method(method)] = checksum
+
 
 class NGIFastqFile(NGIResultFile):
+    __slots__ = ()
+
     def __init__(
         self,
         filepath: str,
         filetype: str = "fastq",
         checksum: str = None,
         checksum_method: str = None,
+        extra_checksums: Optional[Dict[str, str]] = None,
     ) -> None:
         super().__init__(
             filepath=filepath,
             filetype=filetype,
             checksum=checksum,
             checksum_method=checksum_method,
+            extra_checksums=extra_checksums,
         )
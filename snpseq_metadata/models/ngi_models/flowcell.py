@@ -1,12 +1,29 @@
+import fnmatch
 import os
 import datetime
 import logging
-from typing import Dict, List, Optional, Type, TypeVar
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import (
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 import snpseq_metadata.utilities
 from snpseq_metadata.exceptions import FastqFileLocationNotFoundException
 from snpseq_metadata.models.ngi_models.metadata_model import NGIMetadataModel
-from snpseq_metadata.models.ngi_models.experiment import NGIExperimentRef, NGIExperiment
+from snpseq_metadata.models.ngi_models.experiment import (
+    NGIExperimentBase,
+    NGIExperimentRef,
+    NGIExperiment,
+    NGIExperimentSet,
+)
 from snpseq_metadata.models.ngi_models.file_models import NGIFastqFile
 from snpseq_metadata.models.ngi_models.sequencing_run import NGIRun
 from snpseq_metadata.models.ngi_models.sequencing_platform import (
@@ -26,28 +43,72 @@ class NGIFlowcell(NGIMetadataModel):
         project_id: Optional[str] = None,
         sample_id: Optional[str] = None,
         sequencing_runs: List[NGIRun] = None,
+        checksum_workers: int = 1,
+        checksum_cache: Optional[snpseq_metadata.utilities.ChecksumCache] = None,
+        extra_checksum_methods: Optional[List[str]] = None,
+        concurrency: int = 1,
+        project_patterns: Optional[List[str]] = None,
+        sample_patterns: Optional[List[str]] = None,
     ) -> None:
         self.runfolder_path = runfolder_path
         self.runfolder_name = os.path.basename(self.runfolder_path)
         self.flowcell_id = self.runfolder_name.split("_")[-1]
+        self._directory_index = snpseq_metadata.utilities.DirectoryIndex()
         self.samplesheet = (
             os.path.basename(samplesheet)
             if samplesheet
-            else snpseq_metadata.utilities.find_samplesheet(self.runfolder_path)[0]
+            else snpseq_metadata.utilities.find_samplesheet(
+                self.runfolder_path, directory_index=self._directory_index
+            )[0]
         )
         self.run_parameters = (
             os.path.basename(run_parameters)
             if run_parameters
-            else snpseq_metadata.utilities.find_run_parameters(self.runfolder_path)[0]
+            else snpseq_metadata.utilities.find_run_parameters(
+                self.runfolder_path, directory_index=self._directory_index
+            )[0]
         )
         self.project_id = project_id
         self.sample_id = sample_id
+        self._project_patterns = project_patterns
+        self._sample_patterns = sample_patterns
         self.checksum_method = "MD5"
+        self._extra_checksum_methods = extra_checksum_methods
+        self._checksum_workers = checksum_workers
+        self._checksum_index = None
+        self._checksum_cache = checksum_cache
+        self._concurrency = concurrency
         self.platform = self.get_sequencing_platform()
         self.run_date = self.get_run_date()
-        self.sequencing_runs = (
-            sequencing_runs if sequencing_runs else self.get_sequencing_runs()
-        )
+        # the experiments and sequencing runs are looked up on disk the first time they are
+        # accessed, so that creating a flowcell is cheap if only the run information is needed
+        self._experiments = None
+        self._sequencing_runs = sequencing_runs
+
+    @property
+    def experiments(self) -> List[NGIExperimentRef]:
+        if self._experiments is None:
+            self._experiments = self.get_experiments()
+        return self._experiments
+
+    @property
+    def sequencing_runs(self) -> List[NGIRun]:
+        if self._sequencing_runs is None:
+            self._sequencing_runs = self.get_sequencing_runs()
+        return self._sequencing_runs
+
+    @sequencing_runs.setter
+    def sequencing_runs(self, sequencing_runs: Optional[List[NGIRun]]) -> None:
+        self._sequencing_runs = sequencing_runs
+        self.invalidate_indexes()
+
+    def __eq__(self, other: object) -> bool:
+        return super().__eq__(other) and other.sequencing_runs == self.sequencing_runs
+
+    def to_json(self) -> Dict:
+        json_obj = super().to_json()
+        json_obj["sequencing_runs"] = self._item_to_json(self.sequencing_runs)
+        return json_obj
 
     def get_run_date(self) -> Optional[datetime.datetime]:
         datestr = self.runfolder_name.split("_")[0]
@@ -67,6 +128,9 @@ class NGIFlowcell(NGIMetadataModel):
         sequencing_runs = [
             NGIRun.from_json(r) for r in json_obj.get("sequencing_runs", [])
         ]
+        cls.share_descriptors(
+            sequencing_run.experiment for sequencing_run in sequencing_runs
+        )
         return cls(
             runfolder_path=json_obj.get("runfolder_path"),
             samplesheet=json_obj.get("samplesheet"),
@@ -80,6 +144,29 @@ class NGIFlowcell(NGIMetadataModel):
         )
         return checksumfile if os.path.exists(checksumfile) else None
 
+    def get_checksum_index(self) -> snpseq_metadata.utilities.ChecksumIndex:
+        """
+        Get the index of checksums listed in the checksum file of the runfolder. The checksum
+        file is parsed the first time this is called and the index is re-used after that.
+
+        :return: a ChecksumIndex, which will be empty if the checksum file is missing or could
+        not be read
+        """
+        if self._checksum_index is None:
+            checksumfile = self.get_checksumfile()
+            try:
+                self._checksum_index = (
+                    snpseq_metadata.utilities.ChecksumIndex.from_file(
+                        checksumfile=checksumfile, default_method=self.checksum_method
+                    )
+                    if checksumfile
+                    else snpseq_metadata.utilities.ChecksumIndex()
+                )
+            except OSError as ex:
+                log.warning(ex)
+                self._checksum_index = snpseq_metadata.utilities.ChecksumIndex()
+        return self._checksum_index
+
     def get_fastqdir_for_experiment_ref(self, experiment_ref: NGIExperimentRef) -> str:
         fastqdir = self.runfolder_path
         patterns = [
@@ -99,9 +186,8 @@ class NGIFlowcell(NGIMetadataModel):
                     fastqdir,
                     next(
                         filter(
-                            lambda d: os.path.isdir(os.path.join(fastqdir, d))
-                            and d in pattern,
-                            os.listdir(fastqdir),
+                            lambda d: d in pattern,
+                            self._directory_index.subdirs(fastqdir),
                         )
                     ),
                 )
@@ -119,64 +205,247 @@ class NGIFlowcell(NGIMetadataModel):
             os.path.join(self.runfolder_path, self.samplesheet)
         )
         experiments = []
+        seen = set()
         for samplesheet_row in samplesheet_data:
+            # apply the project and sample filters before creating the experiment
+            project_id, sample_id = NGIExperimentRef.ids_from_samplesheet_row(
+                samplesheet_row
+            )
+            if not (
+                self.project_id in (None, project_id)
+                and self.sample_id in (None, sample_id)
+                and self.matches_patterns(project_id, self._project_patterns)
+                and self.matches_patterns(sample_id, self._sample_patterns)
+            ):
+                continue
             experiment = NGIExperimentRef.from_samplesheet_row(
                 samplesheet_row, self.platform
             )
-            if all(
-                [
-                    experiment not in experiments,
-                    self.project_id is None
-                    or experiment.project.project_id == self.project_id,
-                    self.sample_id is None
-                    or experiment.sample.sample_id == self.sample_id,
-                ]
-            ):
+            # the same sample will typically be listed once for each lane
+            if experiment not in seen:
+                seen.add(experiment)
                 experiments.append(experiment)
+        self.share_descriptors(experiments)
         return experiments
 
+    @staticmethod
+    def share_descriptors(experiments: Iterable[NGIExperimentBase]) -> None:
+        """
+        Let experiments referring to the same project or sample share a single NGIStudyRef or
+        NGISampleDescriptor object, rather than each experiment holding its own copy. The
+        experiments are updated in place.
+
+        :param experiments: the experiments to update
+        """
+        descriptors = {}
+        for experiment in experiments:
+            experiment.project = descriptors.setdefault(
+                experiment.project, experiment.project
+            )
+            if isinstance(experiment, NGIExperimentRef):
+                experiment.sample = descriptors.setdefault(
+                    experiment.sample, experiment.sample
+                )
+
+    @staticmethod
+    def matches_patterns(
+        value: str, patterns: Optional[Union[str, Iterable[str]]]
+    ) -> bool:
+        """
+        Check whether a value matches any of the supplied shell-style glob patterns (e.g.
+        "AB-*"). A pattern without wildcards only matches identical values.
+
+        :param value: the value to match
+        :param patterns: a pattern or a list of patterns. If None, any value will match
+        :return: True if the value matches any of the patterns, False otherwise
+        """
+        if patterns is None:
+            return True
+        if isinstance(patterns, str):
+            patterns = [patterns]
+        return any(fnmatch.fnmatchcase(value, pattern) for pattern in patterns)
+
     def get_files_for_experiment_ref(
-        self, experiment_ref: NGIExperimentRef
+        self, experiment_ref: NGIExperimentRef, calculate_checksums: bool = True
     ) -> List[NGIFastqFile]:
         fastqdir = self.get_fastqdir_for_experiment_ref(experiment_ref)
         fastq_extensions = ["fastq.gz", "fastq", "fq.gz", "fq"]
+        checksum_index = self.get_checksum_index()
         fastqfiles = []
         for fastqfile in filter(
             lambda f: any(map(f.endswith, fastq_extensions)),
-            os.listdir(fastqdir),
+            self._directory_index.listdir(fastqdir),
         ):
             fastqpath = os.path.join(fastqdir, fastqfile)
             querypath = os.path.relpath(fastqpath, os.path.dirname(self.runfolder_path))
-            try:
-                checksum = snpseq_metadata.utilities.lookup_checksum_from_file(
-                    checksumfile=self.get_checksumfile(), querypath=querypath
-                )
-            except OSError:
-                checksum = None
-            if checksum is None:
-                checksum = snpseq_metadata.utilities.calculate_checksum_from_file(
-                    queryfile=fastqpath, method=self.checksum_method
-                )
+            checksum = checksum_index.lookup(
+                querypath=querypath, method=self.checksum_method
+            )
+            extra_checksums = {
+                method: checksum_index.lookup(querypath=querypath, method=method)
+                for method in self._extra_checksum_methods or []
+            }
             fastqfiles.append(
                 NGIFastqFile(
                     filepath=fastqpath,
                     checksum=checksum,
                     checksum_method=self.checksum_method,
+                    extra_checksums={
+                        method: extra_checksum
+                        for method, extra_checksum in extra_checksums.items()
+                        if extra_checksum is not None
+                    }
+                    if self._extra_checksum_methods
+                    else None,
                 )
             )
+        if calculate_checksums:
+            self.calculate_checksums(fastqfiles=fastqfiles)
         return sorted(fastqfiles, key=lambda f: f.filepath)
 
+    def calculate_checksums(self, fastqfiles: List[NGIFastqFile]) -> None:
+        """
+        Calculate the checksums that are missing for each of the supplied files and update the
+        file objects in place. All checksum methods that are missing for a file (the primary
+        checksum method and any extra checksum methods) are calculated in a single read of the
+        file. If more than one checksum worker has been configured, the files are hashed
+        concurrently in a pool of threads (hashlib releases the GIL while hashing so this scales
+        with the number of workers). If a checksum cache has been supplied, it is consulted
+        before calculating a checksum and the calculated checksums are added to it.
+
+        :param fastqfiles: a list of NGIFastqFile objects
+        """
+        missing = self.missing_checksums(fastqfiles=fastqfiles)
+        if self._checksum_workers > 1 and len(missing) > 1:
+            with ThreadPoolExecutor(max_workers=self._checksum_workers) as executor:
+                checksums = list(executor.map(self._file_checksums, missing))
+        else:
+            checksums = list(map(self._file_checksums, missing))
+        self.set_checksums(list(zip(missing, checksums)))
+
+    def missing_checksums(
+        self, fastqfiles: List[NGIFastqFile]
+    ) -> List[Tuple[NGIFastqFile, List[str]]]:
+        """
+        Get the checksum methods that need to be calculated for each of the supplied files,
+        after filling in the checksums available in the checksum cache, if any.
+
+        :param fastqfiles: a list of NGIFastqFile objects
+        :return: a list of (file, checksum methods) tuples for the files missing any checksums
+        """
+        methods = [self.checksum_method] + list(self._extra_checksum_methods or [])
+
+        def _missing_methods(fastqfile: NGIFastqFile) -> List[str]:
+            return [
+                method for method in methods if fastqfile.get_checksum(method) is None
+            ]
+
+        if self._checksum_cache is not None:
+            for fastqfile in fastqfiles:
+                for method in _missing_methods(fastqfile):
+                    checksum = self._checksum_cache.get(
+                        queryfile=fastqfile.filepath, method=method
+                    )
+                    if checksum is not None:
+                        fastqfile.set_checksum(method=method, checksum=checksum)
+
+        missing = []
+        for fastqfile in fastqfiles:
+            missing_methods = _missing_methods(fastqfile)
+            if missing_methods:
+                missing.append((fastqfile, missing_methods))
+        return missing
+
+    def _file_checksums(
+        self, item: Tuple[NGIFastqFile, List[str]]
+    ) -> Tuple[Optional[os.stat_result], Dict[str, str]]:
+        # stat the file before hashing it, the stat is used as the key in the checksum cache
+        stat = os.stat(item[0].filepath) if self._checksum_cache is not None else None
+        return stat, snpseq_metadata.utilities.calculate_checksums_from_file(
+            queryfile=item[0].filepath, methods=item[1]
+        )
+
+    def set_checksums(
+        self,
+        calculated: List[
+            Tuple[
+                Tuple[NGIFastqFile, List[str]],
+                Tuple[Optional[os.stat_result], Dict[str, str]],
+            ]
+        ],
+    ) -> None:
+        """
+        Update the file objects with calculated checksums and add them to the checksum cache,
+        if any.
+
+        :param calculated: a list of ((file, checksum methods), (stat, checksums)) tuples, where
+        the stat of the file, if any, was taken before calculating the checksums and the
+        checksums are a dict with checksum methods as keys
+        """
+        for (fastqfile, _), (_, file_checksums) in calculated:
+            for method, checksum in file_checksums.items():
+                fastqfile.set_checksum(method=method, checksum=checksum)
+
+        if self._checksum_cache is not None and calculated:
+            self._checksum_cache.put_many(
+                [
+                    (fastqfile.filepath, method, checksum, stat)
+                    for (fastqfile, _), (stat, file_checksums) in calculated
+                    for method, checksum in file_checksums.items()
+                ]
+            )
+
     def get_sequencing_runs(self) -> List[NGIRun]:
-        return [
-            self.get_sequencing_run_for_experiment_ref(experiment_ref=experiment_ref)
-            for experiment_ref in self.get_experiments()
-        ]
+        """
+        Look up the sequencing runs for the experiments on the flowcell, i.e. the FASTQ files
+        and their checksums. The lookups involve blocking filesystem calls, so they are run in a
+        pool of threads, where the number of threads bounds the number of concurrent lookups.
+        As soon as the files for a sample have been found, the missing checksums for them are
+        submitted to a separate pool of checksum workers, so that hashing overlaps with the
+        lookups for the remaining samples. The checksum cache is only accessed from the calling
+        thread.
+
+        :return: a list of NGIRun objects, in the same order as the experiments
+        """
+        experiment_refs = self.experiments
+        # parse the checksum file before dispatching the lookups that will use it
+        self.get_checksum_index()
+        sequencing_runs = [None] * len(experiment_refs)
+        hashing = []
+        with ThreadPoolExecutor(
+            max_workers=self._concurrency
+        ) as lookup_executor, ThreadPoolExecutor(
+            max_workers=self._checksum_workers
+        ) as checksum_executor:
+            lookups = {
+                lookup_executor.submit(
+                    self.get_sequencing_run_for_experiment_ref,
+                    experiment_ref=experiment_ref,
+                    calculate_checksums=False,
+                ): index
+                for index, experiment_ref in enumerate(experiment_refs)
+            }
+            for lookup in as_completed(lookups):
+                sequencing_run = lookup.result()
+                sequencing_runs[lookups[lookup]] = sequencing_run
+                for item in self.missing_checksums(fastqfiles=sequencing_run.fastqfiles):
+                    hashing.append(
+                        (item, checksum_executor.submit(self._file_checksums, item))
+                    )
+            calculated = [(item, future.result()) for item, future in hashing]
+        log.debug(
+            f"{self._directory_index.syscalls} directories listed in {self.runfolder_name}"
+        )
+        self.set_checksums(calculated)
+        return sequencing_runs
 
     def get_sequencing_run_for_experiment_ref(
-        self, experiment_ref: NGIExperimentRef
+        self, experiment_ref: NGIExperimentRef, calculate_checksums: bool = True
     ) -> NGIRun:
         try:
-            fastqfiles = self.get_files_for_experiment_ref(experiment_ref=experiment_ref)
+            fastqfiles = self.get_files_for_experiment_ref(
+                experiment_ref=experiment_ref, calculate_checksums=calculate_checksums
+            )
         except FastqFileLocationNotFoundException as ex:
             log.warning(ex)
             fastqfiles = []
@@ -192,12 +461,41 @@ class NGIFlowcell(NGIMetadataModel):
     def get_sequencing_run_for_experiment(
         self, experiment: NGIExperiment
     ) -> Optional[NGIRun]:
-        try:
-            return next(
-                filter(
-                    lambda run: run.experiment.is_reference_to(experiment),
-                    self.sequencing_runs,
-                )
+        if isinstance(experiment, NGIExperiment):
+            return self.sequencing_runs_by_alias().get(experiment.alias)
+
+    def sequencing_runs_by_alias(self) -> Mapping[str, NGIRun]:
+        """
+        Get the index of the sequencing runs on the flowcell by the alias of the experiment
+        they refer to, see MetadataModel._cached_index.
+
+        :return: a read-only mapping with experiment aliases as keys and sequencing runs as
+        values
+        """
+        return self._cached_index(
+            "sequencing_runs_by_alias",
+            lambda: (
+                (sequencing_run.experiment.alias, sequencing_run)
+                for sequencing_run in self.sequencing_runs or []
+                if isinstance(sequencing_run.experiment, NGIExperimentRef)
+            ),
+        )
+
+    def join_experiments(
+        self, experiment_set: NGIExperimentSet
+    ) -> List[Tuple[NGIExperiment, NGIRun]]:
+        """
+        Pair the sequencing runs on the flowcell with the experiments they refer to. Sequencing
+        runs referring to an experiment that is not in the supplied set are left out.
+
+        :param experiment_set: a NGIExperimentSet with the experiments to pair the runs with
+        :return: a list of (experiment, sequencing run) tuples, in the order of the runs
+        """
+        pairs = []
+        for sequencing_run in self.sequencing_runs or []:
+            experiment = experiment_set.get_experiment_for_reference(
+                experiment_ref=sequencing_run.experiment
             )
-        except StopIteration:
-            pass
+            if experiment is not None:
+                pairs.append((experiment, sequencing_run))
+        return pairs
@@ -7,6 +7,15 @@ T = TypeVar("T", bound="NGILibrary")
 
 
 class NGILibrary(NGIMetadataModel):
+    __slots__ = (
+        "sample",
+        "description",
+        "application",
+        "sample_type",
+        "library_kit",
+        "is_paired",
+    )
+
     def __init__(
         self,
         sample: NGISampleDescriptor,
@@ -18,9 +27,9 @@ class NGILibrary(NGIMetadataModel):
     ) -> None:
         self.sample = sample
         self.description = description
-        self.application = application
-        self.sample_type = sample_type
-        self.library_kit = library_kit
+        self.application = self._intern(application)
+        self.sample_type = self._intern(sample_type)
+        self.library_kit = self._intern(library_kit)
         self.is_paired = is_paired
 
     @classmethod
@@ -1,4 +1,5 @@
-from typing import Dict, Type, TypeVar
+import sys
+from typing import Dict, Optional, Type, TypeVar
 
 from snpseq_metadata.models.metadata_model import MetadataModel
 
@@ -6,6 +7,18 @@ N = TypeVar("N", bound="NGIMetadataModel")
 
 
 class NGIMetadataModel(MetadataModel):
+    # the NGI models are created in large numbers for a flowcell, so they declare their
+    # attributes in __slots__ rather than having a per-instance __dict__
+    __slots__ = ()
+
+    @staticmethod
+    def _intern(value: Optional[str]) -> Optional[str]:
+        """
+        Intern a string that is likely to be repeated across many model instances (e.g. project
+        ids, platform names and checksum methods), so that a single copy is shared.
+        """
+        return sys.intern(value) if type(value) is str else value
+
     @classmethod
     def from_json(cls: Type[N], json_obj: Dict) -> N:
         raise NotImplementedError
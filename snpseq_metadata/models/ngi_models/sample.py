@@ -6,8 +6,13 @@ T = TypeVar("T", bound="NGISampleDescriptor")
 
 
 class NGISampleDescriptor(NGIMetadataModel):
+    __slots__ = ("sample_id",)
+
     def __init__(self, sample_id: str) -> None:
-        self.sample_id = sample_id
+        self.sample_id = self._intern(sample_id)
+
+    def __hash__(self) -> int:
+        return hash((type(self), self.sample_id))
 
     @classmethod
     def from_json(cls: Type[T], json_obj: Dict) -> T:
@@ -8,9 +8,11 @@ T = TypeVar("T", bound="NGISequencingPlatform")
 
 
 class NGISequencingPlatform(NGIMetadataModel):
+    __slots__ = ("model_name",)
+
     def __init__(self, model_name: str) -> None:
         # split on whitespace
-        self.model_name = model_name.split()[0]
+        self.model_name = self._intern(model_name.split()[0])
 
     @classmethod
     def from_json(cls: Type[T], json_obj: Dict) -> T:
@@ -18,6 +20,7 @@ class NGISequencingPlatform(NGIMetadataModel):
 
 
 class NGIIlluminaSequencingPlatform(NGISequencingPlatform):
+    __slots__ = ()
 
     model_dict: ClassVar[Dict[str, str]] = {
         "a": "NovaSeq",
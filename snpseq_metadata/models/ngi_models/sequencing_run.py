@@ -12,6 +12,7 @@ T = TypeVar("T", bound="NGIRun")
 
 
 class NGIRun(NGIMetadataModel):
+    __slots__ = ("run_alias", "experiment", "platform", "run_date", "fastqfiles")
 
     run_center: ClassVar[str] = "National Genomics Infrastructure, Uppsala"
 
@@ -28,7 +29,13 @@ class NGIRun(NGIMetadataModel):
         self.platform = platform
         self.run_date = run_date
         self.fastqfiles = fastqfiles
-        self.run_center = NGIRun.run_center
+
+    def to_json(self) -> Dict:
+        # the run center is the same for all runs so it is kept in the class rather than in
+        # each instance, but it is still part of the serialized model
+        json_obj = super().to_json()
+        json_obj["run_center"] = self.run_center
+        return json_obj
 
     @classmethod
     def from_json(cls: Type[T], json_obj: Dict) -> T:
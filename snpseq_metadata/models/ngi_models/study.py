@@ -6,8 +6,13 @@ T = TypeVar("T", bound="NGIStudyRef")
 
 
 class NGIStudyRef(NGIMetadataModel):
+    __slots__ = ("project_id",)
+
     def __init__(self, project_id: str) -> None:
-        self.project_id = project_id
+        self.project_id = self._intern(project_id)
+
+    def __hash__(self) -> int:
+        return hash((type(self), self.project_id))
 
     @classmethod
     def from_json(cls: Type[T], json_obj: Dict) -> T:
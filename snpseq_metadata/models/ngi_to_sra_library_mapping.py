@@ -1,4 +1,6 @@
-from typing import List, Type, TypeVar, Union, Optional
+import functools
+import itertools
+from typing import ClassVar, Dict, List, Tuple, Type, TypeVar, Union, Optional
 
 from snpseq_metadata.models.xsdata import (
     TypeLibrarySelection,
@@ -15,8 +17,13 @@ class ApplicationSampleTypeMapping:
     combination of SRA library selection, source and strategy corresponding to a combination of
     NGI application, sample type and library prep. Only the create_object method on this base class
     needs to be called. The base class will query its subclasses for a suitable match.
+
+    The subclass hierarchy is compiled into a lookup table the first time it is needed and the
+    table is discarded whenever a new subclass is defined.
     """
 
+    _lookup_tables: ClassVar[Dict[Type, Tuple[Dict[Tuple, Tuple[int, Type]], List]]] = {}
+
     ngi_application: Union[List[str], str]
     ngi_sample_type: Union[List[str], str]
     ngi_sample_prep_kit: Union[List[str], str]
@@ -41,13 +48,89 @@ class ApplicationSampleTypeMapping:
         parameters or the UnspecifiedLibrary class if nothing could be matched
         """
         return (
-            cls.match_info_to_class(
+            cls._resolve(application, sample_type, sample_prep_kit)
+            or UnspecifiedLibrary
+        )
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        ApplicationSampleTypeMapping._lookup_tables.clear()
+        ApplicationSampleTypeMapping._resolve.cache_clear()
+
+    @classmethod
+    @functools.lru_cache(maxsize=1024)
+    def _resolve(
+        cls: Type[T],
+        application: Optional[str],
+        sample_type: Optional[str],
+        sample_prep_kit: Optional[str],
+    ) -> Optional[Type[T]]:
+        # this gives the same result as match_info_to_class, using the compiled lookup table
+        # for the classes matching on exact values and only evaluating the classes with custom
+        # matching that precede the exact match in the hierarchy
+        exact_matches, custom_matchers = cls._lookup_table()
+        key = tuple(
+            value.lower() if value is not None else None
+            for value in (application, sample_type, sample_prep_kit)
+        )
+        exact_match = exact_matches.get(key)
+        for position, matcher_cls in custom_matchers:
+            if exact_match is not None and position > exact_match[0]:
+                break
+            match = matcher_cls.match_info_to_class(
                 application=application,
                 sample_type=sample_type,
                 sample_prep_kit=sample_prep_kit,
             )
-            or UnspecifiedLibrary
-        )
+            if match is not None:
+                return match
+        return exact_match[1] if exact_match is not None else None
+
+    @classmethod
+    def _lookup_table(
+        cls: Type[T],
+    ) -> Tuple[Dict[Tuple, Tuple[int, Type[T]]], List[Tuple[int, Type[T]]]]:
+        """
+        Compile the hierarchy below this class into a lookup table. The classes that would be
+        compared by match_info_to_class are visited in the same order. The classes using the
+        default matching are added to a dict keyed by each combination of their (lower-case)
+        application, sample type and sample prep kit. The classes overriding match_info_to_class
+        are kept in a list. Each class is recorded with its position in the visiting order, so
+        that the first match can be determined.
+
+        :return: a tuple with the dict of exact matches and the list of custom matchers
+        """
+        if cls not in cls._lookup_tables:
+            exact_matches = {}
+            custom_matchers = []
+            default_matcher = ApplicationSampleTypeMapping.match_info_to_class.__func__
+            positions = itertools.count()
+
+            def _values(cls_value):
+                return [
+                    value
+                    for value in (cls_value if type(cls_value) == list else [cls_value])
+                    if value is not None
+                ]
+
+            def _visit(mapping_cls):
+                if mapping_cls.match_info_to_class.__func__ is not default_matcher:
+                    custom_matchers.append((next(positions), mapping_cls))
+                elif mapping_cls.__subclasses__():
+                    for subclass in mapping_cls.__subclasses__():
+                        _visit(subclass)
+                else:
+                    position = next(positions)
+                    for key in itertools.product(
+                        _values(mapping_cls.ngi_application),
+                        _values(mapping_cls.ngi_sample_type),
+                        _values(mapping_cls.ngi_sample_prep_kit),
+                    ):
+                        exact_matches.setdefault(key, (position, mapping_cls))
+
+            _visit(cls)
+            cls._lookup_tables[cls] = (exact_matches, custom_matchers)
+        return cls._lookup_tables[cls]
 
     @classmethod
     def match_info_to_class(
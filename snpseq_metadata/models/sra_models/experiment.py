@@ -1,4 +1,4 @@
-from typing import ClassVar, List, Type, TypeVar, Optional, Tuple
+from typing import ClassVar, Dict, List, Type, TypeVar, Optional, Tuple
 
 from snpseq_metadata.models.sra_models.sequencing_platform import (
     SRASequencingPlatform,
@@ -49,11 +49,9 @@ class SRAExperimentRef(SRAExperimentBase):
         return [("NAME", self.model_object.refname)]
 
     def is_reference_to(self, other: T) -> bool:
-        return all(
-            [
-                isinstance(other, SRAExperiment),
-                self.model_object.refname == other.model_object.alias,
-            ]
+        return (
+            isinstance(other, SRAExperiment)
+            and self.model_object.refname == other.model_object.alias
         )
 
     def get_reference(self) -> TR:
@@ -74,6 +72,7 @@ class SRAExperiment(SRAExperimentBase):
         self.study_ref = study_ref
         self.platform = platform
         self.library = library
+        self._reference = None
 
     @classmethod
     def create_object(
@@ -106,11 +105,20 @@ class SRAExperiment(SRAExperimentBase):
         return manifest
 
     def get_reference(self) -> SRAExperimentRef:
-        return SRAExperimentRef.create_object(experiment_name=self.model_object.alias)
+        # the reference is re-used as long as the alias of the experiment is unchanged
+        if (
+            self._reference is None
+            or self._reference.model_object.refname != self.model_object.alias
+        ):
+            self._reference = SRAExperimentRef.create_object(
+                experiment_name=self.model_object.alias
+            )
+        return self._reference
 
 
 class SRAExperimentSet(SRAMetadataModel):
     model_object_class: ClassVar[Type] = XSDExperimentSet
+    model_object_children_field: ClassVar[Optional[str]] = "experiment"
 
     def __init__(
         self,
@@ -138,3 +146,19 @@ class SRAExperimentSet(SRAMetadataModel):
             filter(lambda exp: study_ref == exp.study_ref, self.experiments)
         )
         return self.create_object(experiments=experiments)
+
+    def partition_by_study(self) -> Dict[SRAStudyRef, TS]:
+        """
+        Partition the experiments by the study they belong to, in a single pass over the
+        experiments.
+
+        :return: a dict with the study references as keys and the experiment sets for each
+        study as values, in the order the studies first appear in the experiments
+        """
+        experiments_by_study = {}
+        for experiment in self.experiments:
+            experiments_by_study.setdefault(experiment.study_ref, []).append(experiment)
+        return {
+            study_ref: self.create_object(experiments=experiments)
+            for study_ref, experiments in experiments_by_study.items()
+        }
@@ -2,12 +2,9 @@ import os
 
 from typing import ClassVar, TypeVar, Type, List, Tuple
 
+from snpseq_metadata.models.sra_models import vocabulary
 from snpseq_metadata.models.sra_models.metadata_model import SRAMetadataModel
 from snpseq_metadata.models.xsdata import Run, FileFiletype, FileChecksumMethod
-from snpseq_metadata.exceptions import (
-    ChecksumMethodNotRecognizedException,
-    FiletypeNotRecognizedException,
-)
 
 T = TypeVar("T", bound="SRAResultFile")
 
@@ -24,19 +21,23 @@ class SRAResultFile(SRAMetadataModel):
             and self.model_object.checksum_method == other.model_object.checksum_method
         )
 
+    def __hash__(self) -> int:
+        return hash(
+            (
+                os.path.normpath(self.model_object.filename),
+                self.model_object.filetype,
+                self.model_object.checksum,
+                self.model_object.checksum_method,
+            )
+        )
+
     @classmethod
     def object_from_method(cls: Type[T], checksum_method: str) -> FileChecksumMethod:
-        method_dict = {method.value.lower(): method for method in FileChecksumMethod}
-        return cls._object_from_something(
-            checksum_method, method_dict, ChecksumMethodNotRecognizedException
-        )
+        return vocabulary.FILE_CHECKSUM_METHODS.lookup(checksum_method)
 
     @classmethod
     def object_from_filetype(cls: Type[T], filetype: str) -> FileFiletype:
-        filetype_dict = {filetype.value.lower(): filetype for filetype in FileFiletype}
-        return cls._object_from_something(
-            filetype, filetype_dict, FiletypeNotRecognizedException
-        )
+        return vocabulary.FILE_FILETYPES.lookup(filetype)
 
     @classmethod
     def create_object(
@@ -1,11 +1,7 @@
 import dataclasses
-from typing import ClassVar, Dict, Type, TypeVar, Optional, List, Tuple
+from typing import ClassVar, Type, TypeVar, Optional, List, Tuple
 
-from snpseq_metadata.exceptions import (
-    LibraryStrategyNotRecognizedException,
-    LibrarySourceNotRecognizedException,
-    LibrarySelectionNotRecognizedException,
-)
+from snpseq_metadata.models.sra_models import vocabulary
 from snpseq_metadata.models.sra_models.metadata_model import SRAMetadataModel
 from snpseq_metadata.models.xsdata import (
     TypeLibraryStrategy,
@@ -17,7 +13,6 @@ from snpseq_metadata.models.xsdata import (
 from snpseq_metadata.models.sra_models.sample import SRASampleDescriptor
 
 T = TypeVar("T", bound="SRALibrary")
-TLS = TypeVar("TLS", TypeLibraryStrategy, TypeLibrarySelection, TypeLibrarySource)
 
 
 class SRALibrary(SRAMetadataModel):
@@ -47,31 +42,15 @@ class SRALibrary(SRAMetadataModel):
 
     @classmethod
     def object_from_source(cls: Type[T], source: str) -> TypeLibrarySource:
-        return cls._object_from_something(
-            needle=source,
-            haystack=cls._dict_from_enum(TypeLibrarySource),
-            on_error=LibrarySourceNotRecognizedException,
-        )
+        return vocabulary.LIBRARY_SOURCES.lookup(source)
 
     @classmethod
     def object_from_selection(cls: Type[T], selection: str) -> TypeLibrarySelection:
-        return cls._object_from_something(
-            needle=selection,
-            haystack=cls._dict_from_enum(TypeLibrarySelection),
-            on_error=LibrarySelectionNotRecognizedException,
-        )
+        return vocabulary.LIBRARY_SELECTIONS.lookup(selection)
 
     @classmethod
     def object_from_strategy(cls: Type[T], strategy: str) -> TypeLibraryStrategy:
-        return cls._object_from_something(
-            needle=strategy,
-            haystack=cls._dict_from_enum(TypeLibraryStrategy),
-            on_error=LibraryStrategyNotRecognizedException,
-        )
-
-    @staticmethod
-    def _dict_from_enum(enum_cls: TLS) -> Dict[str, TLS]:
-        return {e.value.lower(): e for e in list(enum_cls)}
+        return vocabulary.LIBRARY_STRATEGIES.lookup(strategy)
 
     @classmethod
     def create_object(
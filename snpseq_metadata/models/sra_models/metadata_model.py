@@ -1,5 +1,6 @@
 import dataclasses
-from typing import ClassVar, Dict, Optional, Type, TypeVar, List, Tuple
+import functools
+from typing import ClassVar, Dict, Hashable, Optional, TextIO, Type, TypeVar, List, Tuple
 
 from snpseq_metadata.models.import_export import ModelExporter, ModelImporter
 from snpseq_metadata.models.metadata_model import MetadataModel
@@ -12,6 +13,7 @@ class SRAMetadataModel(MetadataModel):
     model_object_class: ClassVar[Type] = Type[X]
     model_object_meta_class: ClassVar[Optional[Type]] = None
     model_object_parent_field: ClassVar[Optional[Tuple[Type, str]]] = None
+    model_object_children_field: ClassVar[Optional[str]] = None
 
     def __init__(self, model_object: model_object_class):
         self.model_object = model_object
@@ -27,7 +29,75 @@ class SRAMetadataModel(MetadataModel):
         self.exporter = ModelExporter[X]
 
     def __eq__(self, other: object):
-        return super().__eq__(other) and self.to_json() == other.to_json()
+        # compare the underlying dataclasses structurally rather than their serializations, with
+        # the values that are left out of the serializations normalized away
+        return super().__eq__(other) and self.structural_key(
+            self.model_object
+        ) == self.structural_key(other.model_object)
+
+    def __hash__(self) -> int:
+        # only the top level of the dataclass is used for the hash, so that hashing does not
+        # have to walk the whole (mutable) object tree. Objects that compare equal still have
+        # the same hash
+        return hash((type(self), self.structural_key(self.model_object, depth=1)))
+
+    @staticmethod
+    def is_serialized_value(field: dataclasses.Field, value: object) -> bool:
+        """
+        Check whether a dataclass field value is included in the serialization of the dataclass,
+        i.e. that it is not None or an empty list and, for attributes, not the default value.
+        This mirrors ModelExporter.filter_none_empty and the ignore_default_attributes setting
+        used by the exporter.
+        """
+        if value is None or (type(value) is list and not value):
+            return False
+        if field.metadata.get("type") == "Attribute" and not field.metadata.get(
+            "required"
+        ):
+            if field.default_factory is not dataclasses.MISSING:
+                return value != field.default_factory()
+            if field.default is not dataclasses.MISSING:
+                return value != field.default
+        return True
+
+    @classmethod
+    def structural_key(
+        cls: Type[T], obj: object, depth: Optional[int] = None
+    ) -> Hashable:
+        """
+        Get a hashable representation of a (generated) dataclass object, based on its type and
+        the values of its fields, recursively. Field values that are left out when the object
+        is serialized (see is_serialized_value) are left out of the key as well, so objects that
+        only differ in such values have equal keys.
+
+        :param obj: the object to get a key for
+        :param depth: if specified, nested dataclasses and lists deeper than this are only
+        represented by their type and length, respectively
+        :return: a hashable key for the object
+        """
+        if depth is not None and depth <= 0:
+            if dataclasses.is_dataclass(obj):
+                return type(obj)
+            if isinstance(obj, (list, tuple, dict)):
+                return len(obj)
+            return obj
+        depth = None if depth is None else depth - 1
+        if dataclasses.is_dataclass(obj):
+            return (type(obj),) + tuple(
+                (field.name, cls.structural_key(value, depth=depth))
+                for field, value in (
+                    (field, getattr(obj, field.name)) for field in dataclasses.fields(obj)
+                )
+                if cls.is_serialized_value(field, value)
+            )
+        if isinstance(obj, (list, tuple)):
+            return tuple(cls.structural_key(item, depth=depth) for item in obj)
+        if isinstance(obj, dict):
+            return tuple(
+                (key, cls.structural_key(value, depth=depth))
+                for key, value in obj.items()
+            )
+        return obj
 
     def to_json(self, **kwargs: Dict) -> Dict:
         return self.exporter.to_json(
@@ -36,6 +106,14 @@ class SRAMetadataModel(MetadataModel):
             self.model_meta_name,
             **kwargs)
 
+    def write_json(self, fh: TextIO, **kwargs: Dict) -> None:
+        self.exporter.write_json(
+            self.model_object,
+            fh,
+            self.model_entity,
+            self.model_meta_name,
+            **kwargs)
+
     def to_xml(self, **kwargs: Dict) -> str:
         return self.exporter.to_xml(
             self.model_object,
@@ -43,6 +121,15 @@ class SRAMetadataModel(MetadataModel):
             self.model_meta_name,
             **kwargs)
 
+    def write_xml(self, fh: TextIO, **kwargs: Dict) -> None:
+        self.exporter.write_xml(
+            self.model_object,
+            fh,
+            self.model_object_children_field,
+            self.model_entity,
+            self.model_meta_name,
+            **kwargs)
+
     def to_manifest(self) -> List[Tuple[str, str]]:
         raise NotImplementedError
 
@@ -57,6 +144,7 @@ class SRAMetadataModel(MetadataModel):
         )
 
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def dataclass_entity(datacls: Type, cls_field: str):
         try:
             field = next(
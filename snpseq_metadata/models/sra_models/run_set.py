@@ -1,4 +1,4 @@
-from typing import ClassVar, List, Type, TypeVar, Optional, Tuple
+from typing import ClassVar, Dict, List, Mapping, Type, TypeVar, Optional, Tuple
 
 from snpseq_metadata.models.sra_models.metadata_model import SRAMetadataModel
 from snpseq_metadata.models.sra_models.sequencing_run import SRARun
@@ -7,10 +7,12 @@ from snpseq_metadata.models.sra_models.experiment import SRAExperiment, SRAExper
 from snpseq_metadata.models.xsdata import RunSet
 
 T = TypeVar("T", bound="SRARunSet")
+K = TypeVar("K")
 
 
 class SRARunSet(SRAMetadataModel):
     model_object_class: ClassVar[Type] = RunSet
+    model_object_children_field: ClassVar[Optional[str]] = "run"
 
     def __init__(
         self, model_object: model_object_class, runs: Optional[List[SRARun]] = None
@@ -18,11 +20,38 @@ class SRARunSet(SRAMetadataModel):
         super().__init__(model_object=model_object)
         self.runs = runs
 
+    @property
+    def runs(self) -> Optional[List[SRARun]]:
+        return self._runs
+
+    @runs.setter
+    def runs(self, runs: Optional[List[SRARun]]) -> None:
+        self._runs = runs
+        self.invalidate_indexes()
+
+    def __eq__(self, other: object) -> bool:
+        return super().__eq__(other) and other.runs == self.runs
+
+    def __hash__(self) -> int:
+        return super().__hash__()
+
     @classmethod
     def create_object(cls: Type[T], runs: List[SRARun]) -> T:
         model_object = cls.model_object_class(run=[r.model_object for r in runs])
         return cls(model_object=model_object, runs=runs)
 
+    def add_run(self, run: SRARun) -> None:
+        """
+        Add a run to the run set.
+
+        :param run: the SRARun to add
+        """
+        if self.runs is None:
+            self.runs = []
+        self.runs.append(run)
+        self.model_object.run.append(run.model_object)
+        self.invalidate_indexes()
+
     def to_manifest(self) -> List[Tuple[str, str]]:
         manifest = []
         for run in self.runs:
@@ -30,9 +59,55 @@ class SRARunSet(SRAMetadataModel):
         return manifest
 
     def restrict_to_experiments(self, experiments: SRAExperimentSet) -> T:
+        return self._restrict_to_experiments(
+            experiments=experiments, runs_by_alias=self.runs_by_experiment_alias()
+        )
+
+    def partition_by_experiments(
+        self, experiment_sets: Dict[K, SRAExperimentSet]
+    ) -> Dict[K, T]:
+        """
+        Partition the runs according to the experiment sets they belong to. The runs are
+        indexed by experiment alias once and the index is used for all experiment sets.
+
+        :param experiment_sets: a dict with experiment sets as values, e.g. as returned from
+        SRAExperimentSet.partition_by_study
+        :return: a dict with the same keys as the supplied dict and the run set corresponding
+        to each experiment set as values
+        """
+        runs_by_alias = self.runs_by_experiment_alias()
+        return {
+            key: self._restrict_to_experiments(
+                experiments=experiments, runs_by_alias=runs_by_alias
+            )
+            for key, experiments in experiment_sets.items()
+        }
+
+    def runs_by_experiment_alias(self) -> Mapping[str, SRARun]:
+        """
+        Get the index of the runs in the run set by the alias of the experiment they refer to,
+        see MetadataModel._cached_index.
+
+        :return: a read-only mapping with experiment aliases as keys and runs as values
+        """
+        return self._cached_index(
+            "runs_by_experiment_alias",
+            lambda: (
+                (run.experiment.get_reference().model_object.refname, run)
+                for run in self.runs or []
+            ),
+        )
+
+    def _restrict_to_experiments(
+        self, experiments: SRAExperimentSet, runs_by_alias: Mapping[str, SRARun]
+    ) -> T:
         runs = []
         for experiment in experiments.experiments:
-            run = self.get_sequencing_run_for_experiment(experiment=experiment)
+            run = (
+                runs_by_alias.get(experiment.model_object.alias)
+                if isinstance(experiment, SRAExperiment)
+                else None
+            )
             if run:
                 run.experiment = experiment
                 runs.append(run)
@@ -41,14 +116,5 @@ class SRARunSet(SRAMetadataModel):
     def get_sequencing_run_for_experiment(
         self, experiment: SRAExperiment
     ) -> Optional[SRARun]:
-        try:
-            return next(
-                filter(
-                    lambda run: run.experiment.get_reference().is_reference_to(
-                        experiment
-                    ),
-                    self.runs,
-                )
-            )
-        except StopIteration:
-            pass
+        if isinstance(experiment, SRAExperiment):
+            return self.runs_by_experiment_alias().get(experiment.model_object.alias)
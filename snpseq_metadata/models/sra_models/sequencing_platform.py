@@ -2,8 +2,8 @@ import dataclasses
 from typing import ClassVar, Type, TypeVar, List, Tuple
 
 from snpseq_metadata.models.xsdata import PlatformType, TypeIlluminaModel
+from snpseq_metadata.models.sra_models import vocabulary
 from snpseq_metadata.models.sra_models.metadata_model import SRAMetadataModel
-from snpseq_metadata.exceptions import InstrumentModelNotRecognizedException
 
 T = TypeVar("T", "SRASequencingPlatform", "SRAIlluminaSequencingPlatform")
 
@@ -22,21 +22,7 @@ class SRASequencingPlatform(SRAMetadataModel):
 class SRAIlluminaSequencingPlatform(SRASequencingPlatform):
     @classmethod
     def object_from_name(cls: Type[T], model_name: str) -> TypeIlluminaModel:
-        model_dict = {
-            "novaseq": TypeIlluminaModel.ILLUMINA_NOVA_SEQ_6000,
-            "miseq": TypeIlluminaModel.ILLUMINA_MI_SEQ,
-            "iseq": TypeIlluminaModel.ILLUMINA_I_SEQ_100,
-            "hiseqx": TypeIlluminaModel.HI_SEQ_X_TEN,
-            "hiseq2500": TypeIlluminaModel.ILLUMINA_HI_SEQ_2500,
-            "hiseq": TypeIlluminaModel.ILLUMINA_HI_SEQ_2000,
-            "nextseq": TypeIlluminaModel.NEXT_SEQ_500,
-            "": TypeIlluminaModel.UNSPECIFIED,
-        }
-        return cls._object_from_something(
-            needle=model_name or "",
-            haystack=model_dict,
-            on_error=InstrumentModelNotRecognizedException,
-        )
+        return vocabulary.ILLUMINA_MODELS.lookup(model_name or "")
 
     @classmethod
     def create_object(cls: Type[T], model_name: str) -> T:
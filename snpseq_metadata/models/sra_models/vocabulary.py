@@ -0,0 +1,116 @@
+from enum import Enum
+from typing import Dict, Generic, List, Type, TypeVar, Union
+
+from snpseq_metadata.exceptions import (
+    ChecksumMethodNotRecognizedException,
+    FiletypeNotRecognizedException,
+    InstrumentModelNotRecognizedException,
+    LibrarySelectionNotRecognizedException,
+    LibrarySourceNotRecognizedException,
+    LibraryStrategyNotRecognizedException,
+    SomethingNotRecognizedException,
+)
+from snpseq_metadata.models.metadata_model import MetadataModel
+from snpseq_metadata.models.xsdata import (
+    FileChecksumMethod,
+    FileFiletype,
+    TypeIlluminaModel,
+    TypeLibrarySelection,
+    TypeLibrarySource,
+    TypeLibraryStrategy,
+)
+
+E = TypeVar("E")
+V = TypeVar("V", bound="Vocabulary")
+
+
+class Vocabulary(Generic[E]):
+    """
+    A case-insensitive mapping from terms to the corresponding SRA objects (typically members of
+    an xsdata enum). The vocabularies used by the SRA models are created once, when this module is
+    imported, and shared by all models.
+
+    Site-specific terms can be added to a vocabulary with add_alias, e.g.:
+
+        LIBRARY_STRATEGIES.add_alias("whole genome", TypeLibraryStrategy.WGS)
+    """
+
+    def __init__(
+        self, terms: Dict[str, E], on_error: Type[SomethingNotRecognizedException]
+    ) -> None:
+        self.terms = {term.lower(): value for term, value in terms.items()}
+        self.on_error = on_error
+
+    @classmethod
+    def from_enum(
+        cls: Type[V],
+        enum_cls: Type[Enum],
+        on_error: Type[SomethingNotRecognizedException],
+    ) -> V:
+        return cls(
+            terms={member.value: member for member in enum_cls}, on_error=on_error
+        )
+
+    def lookup(self, term: str) -> E:
+        """
+        Look up the object corresponding to a term, ignoring case.
+
+        :param term: the term to look up
+        :return: the object corresponding to the term
+        :raises SomethingNotRecognizedException: the exception type of the vocabulary is raised
+        if the term is not recognized
+        """
+        return MetadataModel._object_from_something(
+            needle=term, haystack=self.terms, on_error=self.on_error
+        )
+
+    def add_alias(self, alias: str, value: Union[str, E]) -> None:
+        """
+        Add an alias to the vocabulary.
+
+        :param alias: the alias to add
+        :param value: the object the alias should correspond to, or a term already in the
+        vocabulary
+        """
+        if isinstance(value, str):
+            value = self.lookup(value)
+        self.terms[alias.lower()] = value
+
+    def __contains__(self, term: str) -> bool:
+        return term.lower() in self.terms
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def keys(self) -> List[str]:
+        return list(self.terms.keys())
+
+
+LIBRARY_STRATEGIES: Vocabulary[TypeLibraryStrategy] = Vocabulary.from_enum(
+    TypeLibraryStrategy, on_error=LibraryStrategyNotRecognizedException
+)
+LIBRARY_SOURCES: Vocabulary[TypeLibrarySource] = Vocabulary.from_enum(
+    TypeLibrarySource, on_error=LibrarySourceNotRecognizedException
+)
+LIBRARY_SELECTIONS: Vocabulary[TypeLibrarySelection] = Vocabulary.from_enum(
+    TypeLibrarySelection, on_error=LibrarySelectionNotRecognizedException
+)
+FILE_CHECKSUM_METHODS: Vocabulary[FileChecksumMethod] = Vocabulary.from_enum(
+    FileChecksumMethod, on_error=ChecksumMethodNotRecognizedException
+)
+FILE_FILETYPES: Vocabulary[FileFiletype] = Vocabulary.from_enum(
+    FileFiletype, on_error=FiletypeNotRecognizedException
+)
+ILLUMINA_MODELS: Vocabulary[TypeIlluminaModel] = Vocabulary(
+    terms={
+        "novaseq": TypeIlluminaModel.ILLUMINA_NOVA_SEQ_6000,
+        "miseq": TypeIlluminaModel.ILLUMINA_MI_SEQ,
+        "iseq": TypeIlluminaModel.ILLUMINA_I_SEQ_100,
+        "hiseqx": TypeIlluminaModel.HI_SEQ_X_TEN,
+        "hiseq2500": TypeIlluminaModel.ILLUMINA_HI_SEQ_2500,
+        "hiseq": TypeIlluminaModel.ILLUMINA_HI_SEQ_2000,
+        "nextseq": TypeIlluminaModel.NEXT_SEQ_500,
+        "": TypeIlluminaModel.UNSPECIFIED,
+    },
+    on_error=InstrumentModelNotRecognizedException,
+)
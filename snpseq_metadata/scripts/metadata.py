@@ -1,10 +1,15 @@
 import click
+import contextlib
+import glob
 import json
 import os
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 from snpseq_metadata.models.ngi_models import NGIFlowcell, NGIExperimentSet
 from snpseq_metadata.models.lims_models import LIMSSequencingContainer
 from snpseq_metadata.models.converter import Converter
+from snpseq_metadata.utilities import ChecksumCache
 
 
 def common_options(function):
@@ -28,10 +33,108 @@ def extract():
     pass
 
 
+def runfolder_options(function):
+    function = click.option(
+        "--sample",
+        "sample_ids",
+        multiple=True,
+        help="restrict the extraction to samples matching this id or glob pattern (can be "
+        "specified multiple times)",
+    )(function)
+    function = click.option(
+        "--project",
+        "project_ids",
+        multiple=True,
+        help="restrict the extraction to projects matching this id or glob pattern (can be "
+        "specified multiple times)",
+    )(function)
+    function = click.option(
+        "--concurrency",
+        type=click.IntRange(min=1),
+        default=1,
+        show_default=True,
+        help="number of samples to look up files and checksums for concurrently",
+    )(function)
+    function = click.option(
+        "--extra-checksum-method",
+        "extra_checksum_methods",
+        type=click.Choice(
+            ["SHA1", "SHA224", "SHA256", "SHA384", "SHA512"], case_sensitive=False
+        ),
+        multiple=True,
+        help="additional checksum method to calculate for the FASTQ files, in the same read "
+        "as the MD5 checksum (can be specified multiple times)",
+    )(function)
+    function = click.option(
+        "--checksum-cache-dir",
+        type=click.Path(file_okay=False, dir_okay=True),
+        default=None,
+        help="directory for a persistent cache of calculated checksums, re-used between runs",
+    )(function)
+    function = click.option(
+        "--checksum-workers",
+        type=click.IntRange(min=1),
+        default=1,
+        show_default=True,
+        help="number of files to calculate missing checksums for in parallel",
+    )(function)
+    return function
+
+
 @click.group(chain=True)
 @common_options
+@runfolder_options
 @click.argument("runfolder_path", nargs=1, type=click.Path(exists=True, dir_okay=True))
-def runfolder(outdir, runfolder_path):
+def runfolder(
+    outdir,
+    checksum_workers,
+    checksum_cache_dir,
+    extra_checksum_methods,
+    concurrency,
+    project_ids,
+    sample_ids,
+    runfolder_path,
+):
+    pass
+
+
+@click.group(chain=True)
+@common_options
+@runfolder_options
+@click.option(
+    "-r",
+    "--runfolder",
+    "runfolder_patterns",
+    multiple=True,
+    help="path to a runfolder, or a glob pattern matching runfolders (can be specified "
+    "multiple times)",
+)
+@click.option(
+    "-f",
+    "--runfolder-list",
+    type=click.File("r"),
+    default=None,
+    help="file listing the paths to runfolders, one per line",
+)
+@click.option(
+    "--runfolder-workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="number of runfolders to process in parallel",
+)
+def runfolders(
+    outdir,
+    checksum_workers,
+    checksum_cache_dir,
+    extra_checksum_methods,
+    concurrency,
+    project_ids,
+    sample_ids,
+    runfolder_patterns,
+    runfolder_list,
+    runfolder_workers,
+):
     pass
 
 
@@ -44,12 +147,133 @@ def snpseq_data(outdir, snpseq_data_file):
     pass
 
 
+def process_runfolder(
+    processors,
+    outdir,
+    checksum_workers,
+    checksum_cache_dir,
+    extra_checksum_methods,
+    concurrency,
+    project_ids,
+    sample_ids,
+    runfolder_path,
+):
+    with contextlib.ExitStack() as stack:
+        checksum_cache = (
+            stack.enter_context(ChecksumCache.in_directory(cachedir=checksum_cache_dir))
+            if checksum_cache_dir
+            else None
+        )
+        ngi_flowcell = NGIFlowcell(
+            runfolder_path=runfolder_path,
+            checksum_workers=checksum_workers,
+            checksum_cache=checksum_cache,
+            extra_checksum_methods=list(extra_checksum_methods) or None,
+            concurrency=concurrency,
+            project_patterns=list(project_ids) or None,
+            sample_patterns=list(sample_ids) or None,
+        )
+        outfile_prefix = os.path.join(outdir, ngi_flowcell.runfolder_name)
+        for processor in processors:
+            processor(ngi_flowcell, outfile_prefix)
+
+
+def expand_runfolder_paths(runfolder_patterns, runfolder_list=None):
+    patterns = list(runfolder_patterns)
+    if runfolder_list is not None:
+        patterns.extend(
+            line.strip()
+            for line in runfolder_list
+            if line.strip() and not line.strip().startswith("#")
+        )
+    runfolder_paths = []
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = filter(os.path.isdir, sorted(glob.glob(pattern)))
+        else:
+            matches = [pattern]
+        runfolder_paths.extend(map(os.path.normpath, matches))
+    # keep the first occurrence of each runfolder
+    return list(dict.fromkeys(runfolder_paths))
+
+
 @runfolder.result_callback()
-def extract_runfolder(processors, outdir, runfolder_path):
-    ngi_flowcell = NGIFlowcell(runfolder_path=runfolder_path)
-    outfile_prefix = os.path.join(outdir, ngi_flowcell.runfolder_name)
-    for processor in processors:
-        processor(ngi_flowcell, outfile_prefix)
+def extract_runfolder(
+    processors,
+    outdir,
+    checksum_workers,
+    checksum_cache_dir,
+    extra_checksum_methods,
+    concurrency,
+    project_ids,
+    sample_ids,
+    runfolder_path,
+):
+    process_runfolder(
+        processors,
+        outdir,
+        checksum_workers,
+        checksum_cache_dir,
+        extra_checksum_methods,
+        concurrency,
+        project_ids,
+        sample_ids,
+        runfolder_path,
+    )
+
+
+@runfolders.result_callback()
+def extract_runfolders(
+    processors,
+    outdir,
+    checksum_workers,
+    checksum_cache_dir,
+    extra_checksum_methods,
+    concurrency,
+    project_ids,
+    sample_ids,
+    runfolder_patterns,
+    runfolder_list,
+    runfolder_workers,
+):
+    runfolder_paths = expand_runfolder_paths(
+        runfolder_patterns=runfolder_patterns, runfolder_list=runfolder_list
+    )
+    if not runfolder_paths:
+        raise click.UsageError("no runfolders were specified or matched")
+
+    # each runfolder opens its own connection to the checksum cache, since an SQLite
+    # connection can not be shared between threads
+    failed = []
+    with ThreadPoolExecutor(max_workers=runfolder_workers) as executor:
+        futures = {
+            executor.submit(
+                process_runfolder,
+                processors,
+                outdir,
+                checksum_workers,
+                checksum_cache_dir,
+                extra_checksum_methods,
+                concurrency,
+                project_ids,
+                sample_ids,
+                runfolder_path,
+            ): runfolder_path
+            for runfolder_path in runfolder_paths
+        }
+        for future in as_completed(futures):
+            runfolder_path = futures[future]
+            try:
+                future.result()
+                click.echo(f"OK\t{runfolder_path}")
+            except Exception as ex:
+                failed.append(runfolder_path)
+                click.echo(f"FAILED\t{runfolder_path}\t{ex!r}", err=True)
+
+    if failed:
+        raise click.ClickException(
+            f"{len(failed)} of {len(runfolder_paths)} runfolders failed"
+        )
 
 
 @snpseq_data.result_callback()
@@ -89,14 +313,15 @@ def export_pipeline(processors, outdir, runfolder_data, snpseq_data):
     sra_run_set = Converter.ngi_to_sra(ngi_model=ngi_flowcell)
     sra_experiment_set = Converter.ngi_to_sra(ngi_experiments)
 
-    projects = list(set(map(lambda exp: exp.study_ref, sra_experiment_set.experiments)))
-    for project in projects:
-        project_experiment_set = sra_experiment_set.restrict_to_study(study_ref=project)
-        project_run_set = sra_run_set.restrict_to_experiments(
-            experiments=project_experiment_set
-        )
+    project_experiment_sets = sra_experiment_set.partition_by_study()
+    project_run_sets = sra_run_set.partition_by_experiments(
+        experiment_sets=project_experiment_sets
+    )
+    for project, project_experiment_set in project_experiment_sets.items():
         for processor in processors:
-            processor(str(project), project_experiment_set, project_run_set, outdir)
+            processor(
+                str(project), project_experiment_set, project_run_sets[project], outdir
+            )
 
 
 @click.command("xml")
@@ -105,7 +330,7 @@ def to_xml():
         for obj_type, sra_obj in [("experiment", experiment_set), ("run", run_set)]:
             outfile = os.path.join(outdir, f"{project_id}-{obj_type}.xml")
             with open(outfile, "w") as fh:
-                fh.write(sra_obj.to_xml())
+                sra_obj.write_xml(fh)
 
     return processor
 
@@ -116,7 +341,7 @@ def to_json():
         for obj_type, sra_obj in [("experiment", experiment_set), ("run", run_set)]:
             outfile = os.path.join(outdir, f"{project_id}-{obj_type}.json")
             with open(outfile, "w") as fh:
-                json.dump(sra_obj.to_json(), fh, indent=2)
+                sra_obj.write_json(fh)
 
     return processor
 
@@ -143,8 +368,10 @@ metadata.add_command(export)
 
 snpseq_data.add_command(extract_to_json)
 runfolder.add_command(extract_to_json)
+runfolders.add_command(extract_to_json)
 extract.add_command(snpseq_data)
 extract.add_command(runfolder)
+extract.add_command(runfolders)
 metadata.add_command(extract)
 
 if __name__ == "__main__":
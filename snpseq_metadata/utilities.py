@@ -1,9 +1,13 @@
 import csv
 import hashlib
 import logging
+import mmap
 import os
+import re
+import sqlite3
+import threading
 from functools import wraps
-from typing import Dict, List, Optional
+from typing import ClassVar, Dict, Iterable, List, Optional, Tuple, Type, TypeVar
 
 from snpseq_metadata.exceptions import (
     NoSampleSheetDataFoundException,
@@ -13,17 +17,61 @@ from snpseq_metadata.exceptions import (
 
 
 log = logging.getLogger(__name__)
+CI = TypeVar("CI", bound="ChecksumIndex")
+CC = TypeVar("CC", bound="ChecksumCache")
 
+# the size of the buffer used when reading files for checksum calculation
+CHECKSUM_BUFFER_SIZE = 1024 * 1024
 
-def calculate_checksum_from_file(queryfile: str, method: str) -> str:
-    if method == "MD5":
-        hasher = hashlib.md5()
-    else:
-        hasher = hashlib.new(method)
 
-    with open(queryfile, "rb") as fh:
-        hasher.update(fh.read())
-    return hasher.hexdigest()
+def calculate_checksum_from_file(
+    queryfile: str, method: str, buffer_size: int = CHECKSUM_BUFFER_SIZE
+) -> str:
+    """
+    Calculate the checksum of a file. The file is streamed through the hasher in chunks, read
+    into a single pre-allocated buffer, so the memory footprint is bounded by the buffer size
+    regardless of the size of the file.
+
+    :param queryfile: path to the file to calculate the checksum for
+    :param method: the checksum algorithm, e.g. MD5 or any name recognized by hashlib.new
+    :param buffer_size: the number of bytes to read from the file in each chunk
+    :return: the hex digest of the file contents
+    """
+    return calculate_checksums_from_file(
+        queryfile=queryfile, methods=[method], buffer_size=buffer_size
+    )[method]
+
+
+def calculate_checksums_from_file(
+    queryfile: str, methods: List[str], buffer_size: int = CHECKSUM_BUFFER_SIZE
+) -> Dict[str, str]:
+    """
+    Calculate several checksums of a file in a single pass, i.e. each chunk read from the file
+    is fed to all hashers before the next chunk is read.
+
+    :param queryfile: path to the file to calculate the checksums for
+    :param methods: the checksum algorithms, e.g. MD5, SHA256 or any name recognized by
+    hashlib.new
+    :param buffer_size: the number of bytes to read from the file in each chunk, must be positive
+    :return: a dict with the supplied methods as keys and the corresponding hex digests as values
+    :raises ValueError: if buffer_size is not positive
+    """
+    # readinto an empty buffer returns 0, which would be taken for the end of the file
+    if buffer_size <= 0:
+        raise ValueError(f"buffer_size must be positive, got {buffer_size}")
+
+    hashers = {
+        method: hashlib.new(normalize_checksum_method(method).lower())
+        for method in methods
+    }
+
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+    with open(queryfile, "rb", buffering=0) as fh:
+        for nbytes in iter(lambda: fh.readinto(buffer), 0):
+            for hasher in hashers.values():
+                hasher.update(view[:nbytes])
+    return {method: hasher.hexdigest() for method, hasher in hashers.items()}
 
 
 def lookup_checksum_from_file(checksumfile: str, querypath: str) -> Optional[str]:
@@ -34,6 +82,249 @@ def lookup_checksum_from_file(checksumfile: str, querypath: str) -> Optional[str
                 return splits[0]
 
 
+def normalize_checksum_method(method: str) -> str:
+    return method.upper().replace("-", "")
+
+
+class ChecksumIndex:
+    """
+    An index of the checksums listed in a checksum manifest. The manifest is parsed once and the
+    checksums are stored in a dict keyed by the normalized path of the file and the checksum
+    method, so that looking up the checksum for a file is a constant time operation.
+
+    The manifest can be in the format written by e.g. md5sum or sha256sum
+    ("<checksum>  <path>") or in the BSD-style format ("MD5 (<path>) = <checksum>"). For the
+    former, the checksum method is inferred from the length of the checksum. Large manifests are
+    memory-mapped rather than read into memory.
+    """
+
+    methods_by_length: ClassVar[Dict[int, str]] = {
+        32: "MD5",
+        40: "SHA1",
+        64: "SHA256",
+        128: "SHA512",
+    }
+    mmap_threshold: ClassVar[int] = 64 * 1024 * 1024
+    bsd_pattern: ClassVar[re.Pattern] = re.compile(r"^([\w-]+) \((.+)\) = ([0-9a-fA-F]+)$")
+
+    def __init__(self, checksums: Optional[Dict[str, Dict[str, str]]] = None) -> None:
+        self.checksums = checksums or {}
+
+    def __len__(self) -> int:
+        return len(self.checksums)
+
+    @staticmethod
+    def normalize_path(path: str) -> str:
+        return os.path.normpath(path)
+
+    def add(self, path: str, checksum: str, method: str) -> None:
+        self.checksums.setdefault(self.normalize_path(path), {}).setdefault(
+            normalize_checksum_method(method), checksum
+        )
+
+    def lookup(self, querypath: str, method: str) -> Optional[str]:
+        return self.checksums.get(self.normalize_path(querypath), {}).get(
+            normalize_checksum_method(method)
+        )
+
+    def parse_line(self, line: str, default_method: Optional[str] = None) -> None:
+        line = line.rstrip("\r\n")
+        if not line or line.startswith("#"):
+            return
+        m = self.bsd_pattern.match(line)
+        if m:
+            method, path, checksum = m.groups()
+        else:
+            splits = line.split(maxsplit=1)
+            if len(splits) != 2:
+                return
+            checksum, path = splits
+            # md5sum and friends prefix the checksum with a backslash if the path was escaped
+            # and the path with an asterisk if the file was read in binary mode
+            if checksum.startswith("\\"):
+                checksum = checksum[1:]
+                path = re.sub(
+                    r"\\(.)", lambda c: "\n" if c.group(1) == "n" else c.group(1), path
+                )
+            path = path[1:] if path.startswith("*") else path
+            method = self.methods_by_length.get(len(checksum), default_method)
+            if method is None:
+                return
+        self.add(path=path, checksum=checksum, method=method)
+
+    @classmethod
+    def from_lines(
+        cls: Type[CI], lines: Iterable[str], default_method: Optional[str] = None
+    ) -> CI:
+        index = cls()
+        for line in lines:
+            index.parse_line(line, default_method=default_method)
+        return index
+
+    @classmethod
+    def from_file(cls: Type[CI], checksumfile: str, default_method: Optional[str] = None) -> CI:
+        """
+        Parse a checksum manifest into a ChecksumIndex.
+
+        :param checksumfile: path to the checksum manifest
+        :param default_method: the checksum method to use for checksums whose method can not be
+        inferred from the manifest
+        :return: a ChecksumIndex with the checksums listed in the manifest
+        :raises OSError: if the manifest could not be read
+        """
+        with open(checksumfile, "rb") as fh:
+            if os.fstat(fh.fileno()).st_size >= cls.mmap_threshold:
+                with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return cls.from_lines(
+                        (line.decode() for line in iter(mm.readline, b"")),
+                        default_method=default_method,
+                    )
+            return cls.from_lines(
+                (line.decode() for line in fh), default_method=default_method
+            )
+
+
+class ChecksumCache:
+    """
+    A persistent cache of calculated checksums, stored in a SQLite database. The checksums are
+    keyed on the absolute path, size, modification time and inode of the file as well as the
+    checksum method, so a cached checksum will not be returned for a file that has been modified
+    or replaced since the checksum was calculated.
+    """
+
+    cachefile_name: ClassVar[str] = "snpseq_metadata_checksums.sqlite"
+
+    def __init__(self, cachefile: str, timeout: float = 30.0) -> None:
+        self.cachefile = cachefile
+        # several processes or threads may write to the same cache, so wait for locks to be
+        # released rather than failing
+        self.connection = sqlite3.connect(self.cachefile, timeout=timeout)
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS checksums ("
+                "path TEXT NOT NULL, "
+                "size INTEGER NOT NULL, "
+                "mtime_ns INTEGER NOT NULL, "
+                "inode INTEGER NOT NULL, "
+                "method TEXT NOT NULL, "
+                "checksum TEXT NOT NULL, "
+                "PRIMARY KEY (path, size, mtime_ns, inode, method))"
+            )
+
+    @classmethod
+    def in_directory(cls: Type[CC], cachedir: str) -> CC:
+        os.makedirs(cachedir, exist_ok=True)
+        return cls(cachefile=os.path.join(cachedir, cls.cachefile_name))
+
+    @staticmethod
+    def cache_key(
+        queryfile: str, method: str, stat: Optional[os.stat_result] = None
+    ) -> Tuple[str, int, int, int, str]:
+        stat = stat or os.stat(queryfile)
+        return (
+            os.path.abspath(queryfile),
+            stat.st_size,
+            stat.st_mtime_ns,
+            stat.st_ino,
+            normalize_checksum_method(method),
+        )
+
+    def get(self, queryfile: str, method: str) -> Optional[str]:
+        try:
+            key = self.cache_key(queryfile=queryfile, method=method)
+        except OSError:
+            return None
+        row = self.connection.execute(
+            "SELECT checksum FROM checksums WHERE "
+            "path = ? AND size = ? AND mtime_ns = ? AND inode = ? AND method = ?",
+            key,
+        ).fetchone()
+        return row[0] if row else None
+
+    def put(
+        self,
+        queryfile: str,
+        method: str,
+        checksum: str,
+        stat: Optional[os.stat_result] = None,
+    ) -> None:
+        self.put_many([(queryfile, method, checksum, stat)])
+
+    def put_many(
+        self, entries: Iterable[Tuple[str, str, str, Optional[os.stat_result]]]
+    ) -> None:
+        """
+        Store checksums in the cache. The stat of each file should be taken before its checksum
+        was calculated, so that a checksum calculated while the file was being modified is
+        stored under the stale key and will not be returned for the modified file.
+
+        :param entries: tuples of (path to file, checksum method, checksum, stat of the file
+        before calculating the checksum). If the stat is None, the file is stat'ed when storing
+        the checksum
+        """
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO checksums "
+                "(path, size, mtime_ns, inode, method, checksum) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    self.cache_key(queryfile=queryfile, method=method, stat=stat)
+                    + (checksum,)
+                    for queryfile, method, checksum, stat in entries
+                ],
+            )
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self: CC) -> CC:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class DirectoryIndex:
+    """
+    A cache of directory listings. Each directory is listed with a single os.scandir call the
+    first time it is accessed and the names of its entries are stored together with whether they
+    are directories, as reported by the DirEntry objects (which on most filesystems does not
+    require an additional stat call). Subsequent lookups in the directory are answered from
+    memory, which saves round trips on network filesystems.
+    """
+
+    def __init__(self) -> None:
+        self.listings: Dict[str, Dict[str, bool]] = {}
+        self.syscalls = 0
+        self._lock = threading.Lock()
+
+    def scan(self, path: str) -> Dict[str, bool]:
+        """
+        Get the entries in a directory.
+
+        :param path: path to the directory
+        :return: a dict with the names of the entries in the directory as keys and a bool
+        indicating whether the entry is a directory as values
+        :raises OSError: if the directory could not be listed
+        """
+        path = os.path.normpath(path)
+        try:
+            return self.listings[path]
+        except KeyError:
+            pass
+        with os.scandir(path) as entries:
+            listing = {entry.name: entry.is_dir() for entry in entries}
+        with self._lock:
+            self.syscalls += 1
+            return self.listings.setdefault(path, listing)
+
+    def listdir(self, path: str) -> List[str]:
+        return list(self.scan(path).keys())
+
+    def subdirs(self, path: str) -> List[str]:
+        return [name for name, is_dir in self.scan(path).items() if is_dir]
+
+
 def parse_samplesheet_data(samplesheet: str) -> List[Dict[str, str]]:
     with open(samplesheet) as fh:
         row = ""
@@ -49,27 +340,37 @@ def parse_samplesheet_data(samplesheet: str) -> List[Dict[str, str]]:
         return [{key.lower(): value for key, value in row.items()} for row in reader]
 
 
-def find_samplesheet(search_path: str, suffix: str = "samplesheet.csv") -> List[str]:
-    csvfiles = find_file(search_path, suffix)
+def find_samplesheet(
+    search_path: str,
+    suffix: str = "samplesheet.csv",
+    directory_index: Optional[DirectoryIndex] = None,
+) -> List[str]:
+    csvfiles = find_file(search_path, suffix, directory_index=directory_index)
     if not csvfiles:
         raise SampleSheetNotFoundException(search_path)
     return csvfiles
 
 
 def find_run_parameters(
-    search_path: str, suffix: str = "runparameters.xml"
+    search_path: str,
+    suffix: str = "runparameters.xml",
+    directory_index: Optional[DirectoryIndex] = None,
 ) -> List[str]:
-    csvfiles = find_file(search_path, suffix)
+    csvfiles = find_file(search_path, suffix, directory_index=directory_index)
     if not csvfiles:
         raise RunParametersNotFoundException(search_path)
     return csvfiles
 
 
-def find_file(search_path: str, suffix: str) -> List[str]:
+def find_file(
+    search_path: str, suffix: str, directory_index: Optional[DirectoryIndex] = None
+) -> List[str]:
     csvfiles = list(
         filter(
             lambda f: f.lower().endswith(suffix),
-            os.listdir(search_path),
+            directory_index.listdir(search_path)
+            if directory_index is not None
+            else os.listdir(search_path),
         )
     )
     return csvfiles
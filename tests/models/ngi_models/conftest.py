@@ -1,5 +1,6 @@
 import pytest
 
+import snpseq_metadata.utilities
 from snpseq_metadata.models.ngi_models import *
 
 
@@ -50,3 +51,21 @@ def samplesheet_experiment_refs(ngi_flowcell_obj, samplesheet_rows):
         )
         for row in samplesheet_rows
     ]
+
+
+@pytest.fixture
+def calculated_checksums(monkeypatch):
+    """
+    Replace the checksum calculation with one returning "<method>-<path>" as the checksum and
+    return the list of (path, methods) that checksums were calculated for, in call order
+    """
+    calculated = []
+
+    def _checksums(queryfile, methods):
+        calculated.append((queryfile, methods))
+        return {method: f"{method}-{queryfile}" for method in methods}
+
+    monkeypatch.setattr(
+        snpseq_metadata.utilities, "calculate_checksums_from_file", _checksums
+    )
+    return calculated
@@ -44,6 +44,15 @@ class TestNGIExperimentRef:
     def test_get_reference(self, ngi_experiment_ref_obj):
         assert ngi_experiment_ref_obj.get_reference() == ngi_experiment_ref_obj
 
+    def test___hash__(self, ngi_experiment_ref_obj, ngi_experiment_ref_json):
+        experiment_ref = NGIExperimentRef.from_json(ngi_experiment_ref_json)
+        assert hash(experiment_ref) == hash(ngi_experiment_ref_obj)
+        assert len({experiment_ref, ngi_experiment_ref_obj}) == 1
+
+        experiment_ref.sample.sample_id = f"other-{experiment_ref.sample.sample_id}"
+        assert experiment_ref != ngi_experiment_ref_obj
+        assert len({experiment_ref, ngi_experiment_ref_obj}) == 2
+
 
 class TestNGIExperiment:
     def test_from_json(self, ngi_experiment_obj, ngi_experiment_json):
@@ -72,3 +81,28 @@ class TestNGIExperimentSet:
             experiment_ref=ngi_experiment_ref_obj
         )
         assert experiment == ngi_experiment_obj
+
+        # the index should follow changes to the experiments
+        ngi_experiment_set_obj.experiments = []
+        assert (
+            ngi_experiment_set_obj.get_experiment_for_reference(
+                experiment_ref=ngi_experiment_ref_obj
+            )
+            is None
+        )
+        # changes made in place must be followed by invalidating the index
+        ngi_experiment_set_obj.experiments.append(ngi_experiment_obj)
+        ngi_experiment_set_obj.invalidate_indexes()
+        assert (
+            ngi_experiment_set_obj.get_experiment_for_reference(
+                experiment_ref=ngi_experiment_ref_obj
+            )
+            is ngi_experiment_obj
+        )
+        # an experiment is not a reference
+        assert (
+            ngi_experiment_set_obj.get_experiment_for_reference(
+                experiment_ref=ngi_experiment_obj
+            )
+            is None
+        )
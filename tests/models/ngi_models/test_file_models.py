@@ -29,6 +29,26 @@ class TestNGIResultFile:
             new_obj = NGIResultFile(**kwargs)
             assert new_obj != ngi_result_file_obj
 
+    def test_extra_checksums(self, ngi_result_file_obj, ngi_result_file_json):
+        method = ngi_result_file_obj.checksum_method
+        assert ngi_result_file_obj.get_checksum(method) == ngi_result_file_obj.checksum
+        assert ngi_result_file_obj.get_checksum("SHA256") is None
+
+        ngi_result_file_obj.set_checksum("sha-256", "this-is-a-sha256-checksum")
+        ngi_result_file_obj.set_checksum(method.lower(), "this-is-a-new-checksum")
+        assert ngi_result_file_obj.checksum == "this-is-a-new-checksum"
+        assert ngi_result_file_obj.extra_checksums == {
+            "SHA256": "this-is-a-sha256-checksum"
+        }
+        assert ngi_result_file_obj.get_checksum("SHA256") == "this-is-a-sha256-checksum"
+        assert ngi_result_file_obj.get_checksum("sha256") == "this-is-a-sha256-checksum"
+
+        # assert that the extra checksums are serialized and de-serialized
+        json_obj = ngi_result_file_obj.to_json()
+        assert json_obj["extra_checksums"] == ngi_result_file_obj.extra_checksums
+        assert NGIResultFile.from_json(json_obj=json_obj) == ngi_result_file_obj
+        assert NGIResultFile.from_json(json_obj=ngi_result_file_json) != ngi_result_file_obj
+
 
 class TestNGIFastqFile:
     def test_from_json(self, ngi_fastq_file_obj, ngi_fastq_file_json):
@@ -37,3 +57,20 @@ class TestNGIFastqFile:
 
     def test_to_json(self, ngi_fastq_file_obj, ngi_fastq_file_json):
         assert ngi_fastq_file_obj.to_json() == ngi_fastq_file_json
+
+    def test_extra_checksums_without_method(self):
+        fastq_file = NGIFastqFile(filepath="file.fastq.gz", checksum="md5-checksum")
+        # without a checksum method, no method is taken to be the primary one
+        assert fastq_file.get_checksum("SHA256") is None
+        fastq_file.set_checksum("SHA256", "sha256-checksum")
+        assert fastq_file.checksum == "md5-checksum"
+        assert fastq_file.checksum_method is None
+        assert fastq_file.get_checksum("SHA256") == "sha256-checksum"
+
+        # a file without a checksum gets the method of the first checksum set as its primary
+        fastq_file = NGIFastqFile(filepath="file.fastq.gz")
+        fastq_file.set_checksum("MD5", "md5-checksum")
+        fastq_file.set_checksum("SHA256", "sha256-checksum")
+        assert fastq_file.checksum == "md5-checksum"
+        assert fastq_file.checksum_method == "MD5"
+        assert fastq_file.extra_checksums == {"SHA256": "sha256-checksum"}
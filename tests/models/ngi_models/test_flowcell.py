@@ -1,5 +1,7 @@
+import asyncio
 import os
 import pytest
+import time
 import uuid
 
 import snpseq_metadata.utilities
@@ -23,6 +25,50 @@ class TestNGIFlowcell:
             k: obs_json.get(k) for k in ngi_flowcell_json.keys()
         } == ngi_flowcell_json
 
+    def test_from_json_without_sequencing_runs(self, ngi_flowcell_json, monkeypatch):
+        def _fail(*args, **kwargs):
+            raise AssertionError("the filesystem should not be accessed")
+
+        monkeypatch.setattr(NGIFlowcell, "get_sequencing_runs", _fail)
+        monkeypatch.setattr(os, "listdir", _fail)
+        monkeypatch.setattr(os, "scandir", _fail)
+        ngi_flowcell_json["sequencing_runs"] = []
+        flowcell = NGIFlowcell.from_json(json_obj=ngi_flowcell_json)
+        assert flowcell.sequencing_runs == []
+        assert flowcell.to_json()["sequencing_runs"] == []
+
+    def test_lazy_sequencing_runs(
+        self, ngi_flowcell_obj, samplesheet_experiment_refs, monkeypatch
+    ):
+        calls = []
+
+        def _experiments():
+            calls.append("experiments")
+            return samplesheet_experiment_refs
+
+        def _sequencing_run(experiment_ref, calculate_checksums):
+            calls.append(experiment_ref.alias)
+            return NGIRun(
+                run_alias=experiment_ref.alias,
+                experiment=experiment_ref,
+                platform=ngi_flowcell_obj.platform,
+                fastqfiles=[],
+            )
+
+        monkeypatch.setattr(ngi_flowcell_obj, "get_experiments", _experiments)
+        monkeypatch.setattr(
+            ngi_flowcell_obj, "get_sequencing_run_for_experiment_ref", _sequencing_run
+        )
+        ngi_flowcell_obj.sequencing_runs = None
+        assert not calls
+
+        # the sequencing runs should be looked up on first access only
+        sequencing_runs = ngi_flowcell_obj.sequencing_runs
+        assert len(calls) == len(samplesheet_experiment_refs) + 1
+        assert ngi_flowcell_obj.sequencing_runs is sequencing_runs
+        assert ngi_flowcell_obj.experiments is ngi_flowcell_obj.experiments
+        assert len(calls) == len(samplesheet_experiment_refs) + 1
+
     def test_get_run_date(self, ngi_flowcell_obj, run_date):
         ngi_flowcell_obj.runfolder_name = f"{run_date.strftime('%y%m%d')}_whatever..."
         assert ngi_flowcell_obj.get_run_date() == run_date
@@ -50,6 +96,18 @@ class TestNGIFlowcell:
         )
         assert ngi_flowcell_obj.get_checksumfile() == exp_checksum_file
 
+    def test_get_checksum_index(self, ngi_flowcell_obj, runfolder_path, monkeypatch):
+        # a missing checksum file should give an empty index
+        assert len(ngi_flowcell_obj.get_checksum_index()) == 0
+
+        # the checksum file should only be parsed once
+        ngi_flowcell_obj.runfolder_path = runfolder_path
+        ngi_flowcell_obj._checksum_index = None
+        checksum_index = ngi_flowcell_obj.get_checksum_index()
+        assert len(checksum_index) > 0
+        monkeypatch.setattr(ngi_flowcell_obj, "get_checksumfile", None)
+        assert ngi_flowcell_obj.get_checksum_index() is checksum_index
+
     def test_get_sequencing_run_for_experiment(
         self, ngi_flowcell_obj, ngi_experiment_obj, ngi_sequencing_run_obj
     ):
@@ -66,6 +124,41 @@ class TestNGIFlowcell:
             is None
         )
 
+    def test_sequencing_runs_by_alias(self, ngi_flowcell_obj, ngi_sequencing_run_obj):
+        alias = ngi_sequencing_run_obj.experiment.alias
+        runs_by_alias = ngi_flowcell_obj.sequencing_runs_by_alias()
+        assert runs_by_alias == {alias: ngi_sequencing_run_obj}
+        # the index is read-only
+        with pytest.raises(TypeError):
+            runs_by_alias[alias] = None
+
+        # the index is rebuilt when the sequencing runs are replaced or invalidated
+        ngi_flowcell_obj.sequencing_runs = []
+        assert ngi_flowcell_obj.sequencing_runs_by_alias() == {}
+        ngi_flowcell_obj.sequencing_runs.append(ngi_sequencing_run_obj)
+        assert ngi_flowcell_obj.sequencing_runs_by_alias() == {}
+        ngi_flowcell_obj.invalidate_indexes()
+        assert ngi_flowcell_obj.sequencing_runs_by_alias() == {
+            alias: ngi_sequencing_run_obj
+        }
+
+    def test_join_experiments(
+        self,
+        ngi_flowcell_obj,
+        ngi_experiment_obj,
+        ngi_experiment_set_obj,
+        ngi_sequencing_run_obj,
+    ):
+        assert ngi_flowcell_obj.join_experiments(
+            experiment_set=ngi_experiment_set_obj
+        ) == [(ngi_experiment_obj, ngi_sequencing_run_obj)]
+
+        ngi_experiment_set_obj.experiments = []
+        assert (
+            ngi_flowcell_obj.join_experiments(experiment_set=ngi_experiment_set_obj)
+            == []
+        )
+
     def test_get_sequencing_run_for_experiment_ref(
         self, ngi_flowcell_obj, ngi_experiment_ref_obj, ngi_fastq_file_obj, monkeypatch
     ):
@@ -90,6 +183,76 @@ class TestNGIFlowcell:
         )
         assert obs_run_obj == exp_run_obj
 
+    def test_get_sequencing_runs_concurrency(
+        self, ngi_flowcell_obj, samplesheet_experiment_refs, monkeypatch
+    ):
+        def _sequencing_run(experiment_ref, calculate_checksums):
+            # make the lookups finish in the reverse order
+            index = samplesheet_experiment_refs.index(experiment_ref)
+            time.sleep(0.001 * (len(samplesheet_experiment_refs) - index))
+            return NGIRun(
+                run_alias=experiment_ref.alias,
+                experiment=experiment_ref,
+                platform=ngi_flowcell_obj.platform,
+                fastqfiles=[],
+            )
+
+        monkeypatch.setattr(
+            ngi_flowcell_obj, "get_experiments", lambda: samplesheet_experiment_refs
+        )
+        monkeypatch.setattr(
+            ngi_flowcell_obj, "get_sequencing_run_for_experiment_ref", _sequencing_run
+        )
+        # assert that the runs are returned in the order of the experiments regardless of the
+        # concurrency
+        for concurrency in [1, 4]:
+            ngi_flowcell_obj._concurrency = concurrency
+            assert [
+                run.experiment for run in ngi_flowcell_obj.get_sequencing_runs()
+            ] == samplesheet_experiment_refs
+
+    def test_get_sequencing_runs_pipelined(
+        self,
+        ngi_flowcell_obj,
+        samplesheet_experiment_refs,
+        calculated_checksums,
+        monkeypatch,
+    ):
+        first_fastqfile = f"{samplesheet_experiment_refs[0].alias}.fastq.gz"
+
+        def _sequencing_run(experiment_ref, calculate_checksums):
+            # the last lookup only finishes once hashing of the files found for the first
+            # sample has started
+            if experiment_ref is samplesheet_experiment_refs[-1]:
+                deadline = time.monotonic() + 5
+                while (first_fastqfile, ["MD5"]) not in calculated_checksums:
+                    assert time.monotonic() < deadline
+                    time.sleep(0.01)
+            return NGIRun(
+                run_alias=experiment_ref.alias,
+                experiment=experiment_ref,
+                platform=ngi_flowcell_obj.platform,
+                fastqfiles=[NGIFastqFile(filepath=f"{experiment_ref.alias}.fastq.gz")],
+            )
+
+        monkeypatch.setattr(
+            ngi_flowcell_obj, "get_experiments", lambda: samplesheet_experiment_refs
+        )
+        monkeypatch.setattr(
+            ngi_flowcell_obj, "get_sequencing_run_for_experiment_ref", _sequencing_run
+        )
+        ngi_flowcell_obj._concurrency = 2
+
+        async def _in_event_loop():
+            # the lookups do not depend on there being no running event loop
+            return ngi_flowcell_obj.get_sequencing_runs()
+
+        sequencing_runs = asyncio.run(_in_event_loop())
+        assert [run.experiment for run in sequencing_runs] == samplesheet_experiment_refs
+        for sequencing_run in sequencing_runs:
+            fastqfile = sequencing_run.fastqfiles[0]
+            assert fastqfile.checksum == f"MD5-{fastqfile.filepath}"
+
     def test_get_fastqdir_for_experiment_ref(
         self, ngi_flowcell_obj, ngi_experiment_ref_obj, tmpdir
     ):
@@ -133,16 +296,14 @@ class TestNGIFlowcell:
         def _fastqdir(*args, **kwargs):
             return os.path.join(tmpdir, "fastq")
 
-        def _checksum(checksumfile, querypath):
+        def _checksum(self, querypath, method):
             return querypath
 
         # set up the test
         monkeypatch.setattr(
             ngi_flowcell_obj, "get_fastqdir_for_experiment_ref", _fastqdir
         )
-        monkeypatch.setattr(
-            snpseq_metadata.utilities, "lookup_checksum_from_file", _checksum
-        )
+        monkeypatch.setattr(snpseq_metadata.utilities.ChecksumIndex, "lookup", _checksum)
         ngi_flowcell_obj.runfolder_path = tmpdir
 
         # define and touch files expected to be found and not to be found
@@ -190,6 +351,95 @@ class TestNGIFlowcell:
         )
         assert obs_objs == exp_objs
 
+    def test_calculate_checksums(self, ngi_flowcell_obj, calculated_checksums):
+        method = ngi_flowcell_obj.checksum_method
+        # assert that only missing checksums are calculated, that each file is hashed once and
+        # that the checksums are assigned to the correct file regardless of the number of workers
+        for workers in [1, 4]:
+            calculated_checksums.clear()
+            fastqfiles = [
+                NGIFastqFile(
+                    filepath=f"file-{i}.fastq.gz",
+                    checksum=checksum,
+                    checksum_method=method,
+                )
+                for i, checksum in enumerate([None, "existing-checksum", None, None])
+            ]
+            ngi_flowcell_obj._checksum_workers = workers
+            ngi_flowcell_obj.calculate_checksums(fastqfiles=fastqfiles)
+            assert sorted(calculated_checksums) == [
+                (fastqfiles[i].filepath, [method]) for i in [0, 2, 3]
+            ]
+            assert [fastqfile.checksum for fastqfile in fastqfiles] == [
+                f"{method}-{fastqfiles[0].filepath}",
+                "existing-checksum",
+                f"{method}-{fastqfiles[2].filepath}",
+                f"{method}-{fastqfiles[3].filepath}",
+            ]
+
+    def test_calculate_checksums_extra_methods(
+        self, ngi_flowcell_obj, calculated_checksums
+    ):
+        ngi_flowcell_obj._extra_checksum_methods = ["SHA256"]
+        fastqfiles = [
+            NGIFastqFile(
+                filepath="file-1.fq",
+                checksum="md5-checksum",
+                checksum_method=ngi_flowcell_obj.checksum_method,
+            ),
+            NGIFastqFile(
+                filepath="file-2.fq",
+                checksum_method=ngi_flowcell_obj.checksum_method,
+                extra_checksums={"SHA256": "sha256-checksum"},
+            ),
+            NGIFastqFile(
+                filepath="file-3.fq", checksum_method=ngi_flowcell_obj.checksum_method
+            ),
+        ]
+        ngi_flowcell_obj.calculate_checksums(fastqfiles=fastqfiles)
+
+        # assert that all missing checksums for a file are calculated in one go
+        assert calculated_checksums == [
+            ("file-1.fq", ["SHA256"]),
+            ("file-2.fq", ["MD5"]),
+            ("file-3.fq", ["MD5", "SHA256"]),
+        ]
+        assert [
+            (fastqfile.checksum, fastqfile.extra_checksums) for fastqfile in fastqfiles
+        ] == [
+            ("md5-checksum", {"SHA256": "SHA256-file-1.fq"}),
+            ("MD5-file-2.fq", {"SHA256": "sha256-checksum"}),
+            ("MD5-file-3.fq", {"SHA256": "SHA256-file-3.fq"}),
+        ]
+
+    def test_calculate_checksums_cache(
+        self, ngi_flowcell_obj, tmpdir, calculated_checksums
+    ):
+        method = ngi_flowcell_obj.checksum_method
+        fastqfiles = []
+        for i in range(3):
+            fastqfiles.append(NGIFastqFile(filepath=os.path.join(tmpdir, f"file-{i}.fq")))
+            open(fastqfiles[-1].filepath, "w").close()
+
+        with snpseq_metadata.utilities.ChecksumCache.in_directory(
+            os.path.join(tmpdir, "cache")
+        ) as checksum_cache:
+            ngi_flowcell_obj._checksum_cache = checksum_cache
+            ngi_flowcell_obj.calculate_checksums(fastqfiles=fastqfiles[0:2])
+            assert calculated_checksums == [
+                (fastqfile.filepath, [method]) for fastqfile in fastqfiles[0:2]
+            ]
+
+            # assert that cached checksums are not calculated again
+            calculated_checksums.clear()
+            for fastqfile in fastqfiles:
+                fastqfile.checksum = None
+            ngi_flowcell_obj.calculate_checksums(fastqfiles=fastqfiles)
+            assert calculated_checksums == [(fastqfiles[2].filepath, [method])]
+            assert [fastqfile.checksum for fastqfile in fastqfiles] == [
+                f"{method}-{fastqfile.filepath}" for fastqfile in fastqfiles
+            ]
+
     def test_get_experiments(
         self,
         ngi_flowcell_obj,
@@ -234,3 +484,35 @@ class TestNGIFlowcell:
         )
         ngi_flowcell_obj.sample_id = sample_id
         assert ngi_flowcell_obj.get_experiments() == exp_experiments
+
+        # assert that experiments can be restricted by lists of glob patterns
+        ngi_flowcell_obj.project_id = None
+        ngi_flowcell_obj.sample_id = None
+        ngi_flowcell_obj._project_patterns = ["no-such-project", f"{project_id[:-1]}*"]
+        ngi_flowcell_obj._sample_patterns = ["no-such-sample", f"*{sample_id[1:]}"]
+        assert ngi_flowcell_obj.get_experiments() == exp_experiments
+
+        # assert that the patterns are not serialized
+        json_obj = ngi_flowcell_obj.to_json()
+        assert "project_id" not in json_obj
+        assert "sample_id" not in json_obj
+
+        ngi_flowcell_obj._sample_patterns = ["no-such-sample"]
+        assert ngi_flowcell_obj.get_experiments() == []
+
+    def test_matches_patterns(self):
+        assert NGIFlowcell.matches_patterns("AB-1234", None)
+        assert NGIFlowcell.matches_patterns("AB-1234", "AB-1234")
+        assert not NGIFlowcell.matches_patterns("AB-1234", "AB-123")
+        assert NGIFlowcell.matches_patterns("AB-1234", ["CD-*", "AB-*"])
+        assert not NGIFlowcell.matches_patterns("AB-1234", ["CD-*", "ab-*"])
+        assert not NGIFlowcell.matches_patterns("AB-1234", [])
+
+    def test_share_descriptors(self, ngi_flowcell_json):
+        flowcell = NGIFlowcell.from_json(json_obj=ngi_flowcell_json)
+        projects = {}
+        for sequencing_run in flowcell.sequencing_runs:
+            project = sequencing_run.experiment.project
+            # experiments in the same project should refer to the same object
+            assert projects.setdefault(project.project_id, project) is project
+        assert flowcell.to_json()["sequencing_runs"] == ngi_flowcell_json["sequencing_runs"]
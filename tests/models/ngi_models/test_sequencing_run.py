@@ -8,3 +8,15 @@ class TestNGIRun:
 
     def test_to_json(self, ngi_sequencing_run_obj, ngi_sequencing_run_json):
         assert ngi_sequencing_run_obj.to_json() == ngi_sequencing_run_json
+
+    def test_slots(self, ngi_sequencing_run_obj, ngi_sequencing_run_json):
+        # the models should not have a per-instance __dict__
+        assert not hasattr(ngi_sequencing_run_obj, "__dict__")
+        assert not hasattr(ngi_sequencing_run_obj.fastqfiles[0], "__dict__")
+        assert not hasattr(ngi_sequencing_run_obj.experiment.project, "__dict__")
+        # the run center is kept in the class but is still serialized
+        assert (
+            ngi_sequencing_run_obj.to_json()["run_center"]
+            == ngi_sequencing_run_json["run_center"]
+            == NGIRun.run_center
+        )
@@ -2,6 +2,7 @@ from snpseq_metadata.models.sra_models import (
     SRAExperiment,
     SRAExperimentRef,
     SRAExperimentSet,
+    SRAStudyRef,
 )
 
 from tests.models.conftest import ignore_xml_namespace_attributes
@@ -64,6 +65,11 @@ class TestSRAExperiment:
     def test_get_reference(self, sra_experiment_obj, sra_experiment_ref_obj):
         assert sra_experiment_obj.get_reference() == sra_experiment_ref_obj
 
+        # the reference should be re-used until the alias changes
+        assert sra_experiment_obj.get_reference() is sra_experiment_obj.get_reference()
+        sra_experiment_obj.model_object.alias = f"new-{sra_experiment_obj.model_object.alias}"
+        assert str(sra_experiment_obj.get_reference()) == sra_experiment_obj.model_object.alias
+
     def test_create_object(self, sra_experiment_obj):
         obj = SRAExperiment.create_object(
             alias=sra_experiment_obj.model_object.alias,
@@ -98,3 +104,28 @@ class TestSRAExperimentSet:
             study_ref=sra_experiment_obj.study_ref
         )
         assert experiment_set.experiments == [sra_experiment_obj]
+
+    def test_partition_by_study(self, sra_experiment_obj):
+        other_study_ref = SRAStudyRef.create_object(
+            refname=f"other-{sra_experiment_obj.study_ref}"
+        )
+        other_experiment = SRAExperiment.create_object(
+            alias=f"other-{sra_experiment_obj.model_object.alias}",
+            title=sra_experiment_obj.model_object.title,
+            study_ref=other_study_ref,
+            platform=sra_experiment_obj.platform,
+            library=sra_experiment_obj.library,
+        )
+        experiment_set = SRAExperimentSet.create_object(
+            experiments=[sra_experiment_obj, other_experiment, sra_experiment_obj]
+        )
+        experiment_sets = experiment_set.partition_by_study()
+        assert list(experiment_sets.keys()) == [
+            sra_experiment_obj.study_ref,
+            other_study_ref,
+        ]
+        assert experiment_sets[sra_experiment_obj.study_ref].experiments == [
+            sra_experiment_obj,
+            sra_experiment_obj,
+        ]
+        assert experiment_sets[other_study_ref].experiments == [other_experiment]
@@ -1,9 +1,23 @@
 
+import dataclasses
+from typing import Optional
+
+import pytest
+
+from snpseq_metadata.models.sra_models import SRAExperimentRef, SRAExperimentSet, SRARun
 from snpseq_metadata.models.sra_models.run_set import SRARunSet
+from snpseq_metadata.models.xsdata import RunSet
 
 from tests.models.conftest import ignore_xml_namespace_attributes
 
 
+@dataclasses.dataclass
+class DefaultAttribute:
+    value: Optional[str] = dataclasses.field(
+        default="default", metadata={"type": "Attribute"}
+    )
+
+
 class TestSRARunSet:
     def test_create_object(self, sra_sequencing_run_set_obj, sra_sequencing_run_obj):
         sequencing_run_set = SRARunSet.create_object(runs=[sra_sequencing_run_obj])
@@ -40,6 +54,58 @@ class TestSRARunSet:
             run.experiment for run in sequencing_run_set.runs
         ] == sra_experiment_set_obj.experiments
 
+    def test_partition_by_experiments(
+        self, sra_sequencing_run_set_obj, sra_experiment_set_obj
+    ):
+        run_sets = sra_sequencing_run_set_obj.partition_by_experiments(
+            experiment_sets={
+                "first": sra_experiment_set_obj,
+                "second": SRAExperimentSet.create_object(experiments=[]),
+            }
+        )
+        assert list(run_sets.keys()) == ["first", "second"]
+        assert [
+            run.experiment for run in run_sets["first"].runs
+        ] == sra_experiment_set_obj.experiments
+        assert run_sets["second"].runs == []
+
+    def test_runs_by_experiment_alias(self, sra_sequencing_run_obj):
+        sequencing_run_set = SRARunSet.create_object(
+            runs=[sra_sequencing_run_obj, sra_sequencing_run_obj]
+        )
+        assert sequencing_run_set.runs_by_experiment_alias() == {
+            str(sra_sequencing_run_obj.experiment.get_reference()): sra_sequencing_run_obj
+        }
+
+    def test_runs_by_experiment_alias_invalidation(
+        self, sra_sequencing_run_obj, sra_experiment_obj
+    ):
+        sequencing_run_set = SRARunSet.create_object(runs=[sra_sequencing_run_obj])
+        alias = str(sra_sequencing_run_obj.experiment.get_reference())
+        runs_by_alias = sequencing_run_set.runs_by_experiment_alias()
+        assert runs_by_alias[alias] is sra_sequencing_run_obj
+        # the index is read-only
+        with pytest.raises(TypeError):
+            runs_by_alias[alias] = None
+
+        # the index is rebuilt when the runs are replaced
+        sequencing_run_set.runs = []
+        assert sequencing_run_set.runs_by_experiment_alias() == {}
+
+        # and when the runs are modified in place and the indexes are invalidated
+        sequencing_run_set.runs = [sra_sequencing_run_obj]
+        assert alias in sequencing_run_set.runs_by_experiment_alias()
+        sequencing_run_set.runs[0] = SRARun.create_object(
+            run_alias="another-run",
+            experiment=SRAExperimentRef.create_object(experiment_name="another-alias"),
+            run_center="another-center",
+            fastqfiles=[],
+        )
+        sequencing_run_set.invalidate_indexes()
+        assert list(sequencing_run_set.runs_by_experiment_alias().keys()) == [
+            "another-alias"
+        ]
+
     def test_get_sequencing_run_for_experiment(
         self, sra_sequencing_run_set_obj, sra_sequencing_run_obj
     ):
@@ -49,3 +115,50 @@ class TestSRARunSet:
             )
             == sra_sequencing_run_obj
         )
+
+    def test_add_run(self, sra_sequencing_run_obj, sra_experiment_obj):
+        sequencing_run_set = SRARunSet.create_object(runs=[])
+        assert (
+            sequencing_run_set.get_sequencing_run_for_experiment(sra_experiment_obj)
+            is None
+        )
+        sequencing_run_set.add_run(sra_sequencing_run_obj)
+        assert sequencing_run_set.runs == [sra_sequencing_run_obj]
+        assert sequencing_run_set.model_object.run == [
+            sra_sequencing_run_obj.model_object
+        ]
+        assert (
+            sequencing_run_set.get_sequencing_run_for_experiment(sra_experiment_obj)
+            is sra_sequencing_run_obj
+        )
+
+        # the index should be rebuilt if the runs are replaced
+        sequencing_run_set.runs = []
+        assert (
+            sequencing_run_set.get_sequencing_run_for_experiment(sra_experiment_obj)
+            is None
+        )
+
+    def test___eq___serialized_values(self):
+        # values that are left out of the serialization should not affect equality
+        empty_run_set = SRARunSet(model_object=RunSet(run=[]))
+        none_run_set = SRARunSet(model_object=RunSet(run=None))
+        assert empty_run_set.to_json() == none_run_set.to_json()
+        assert empty_run_set == none_run_set
+        assert hash(empty_run_set) == hash(none_run_set)
+
+        assert SRARunSet.structural_key(
+            DefaultAttribute(value="default")
+        ) == SRARunSet.structural_key(DefaultAttribute(value=None))
+        assert SRARunSet.structural_key(
+            DefaultAttribute(value="default")
+        ) != SRARunSet.structural_key(DefaultAttribute(value="other"))
+
+    def test___hash__(self, sra_sequencing_run_set_obj, sra_sequencing_run_obj):
+        # only the top level of the object tree is used for the hash
+        assert SRARunSet.structural_key(
+            sra_sequencing_run_set_obj.model_object, depth=1
+        ) == (RunSet, ("run", 1))
+        assert hash(sra_sequencing_run_set_obj) == hash(
+            SRARunSet.create_object(runs=[sra_sequencing_run_obj])
+        )
@@ -22,6 +22,18 @@ class TestSRARun:
         )
         assert sequencing_run == sra_sequencing_run_obj
 
+    def test___eq__(self, sra_sequencing_run_obj, sra_sequencing_run_json):
+        other_obj = SRARun(model_object=SRARun.from_json(json_obj=sra_sequencing_run_json))
+        other_obj.experiment = sra_sequencing_run_obj.experiment
+        other_obj.fastqfiles = sra_sequencing_run_obj.fastqfiles
+        assert other_obj == sra_sequencing_run_obj
+        assert hash(other_obj) == hash(sra_sequencing_run_obj)
+        assert len({other_obj, sra_sequencing_run_obj}) == 1
+
+        other_obj.model_object.title = f"not-equal-to-{other_obj.model_object.title}"
+        assert other_obj != sra_sequencing_run_obj
+        assert hash(other_obj) != hash(sra_sequencing_run_obj)
+
     def test_to_json(self, sra_sequencing_run_obj, sra_sequencing_run_json):
         assert sra_sequencing_run_obj.to_json() == sra_sequencing_run_json
 
@@ -0,0 +1,40 @@
+import pytest
+
+from snpseq_metadata.exceptions import LibraryStrategyNotRecognizedException
+from snpseq_metadata.models.sra_models import vocabulary
+from snpseq_metadata.models.sra_models.vocabulary import Vocabulary
+from snpseq_metadata.models.xsdata import TypeIlluminaModel, TypeLibraryStrategy
+
+
+class TestVocabulary:
+    @pytest.fixture
+    def strategies(self):
+        return Vocabulary.from_enum(
+            TypeLibraryStrategy, on_error=LibraryStrategyNotRecognizedException
+        )
+
+    def test_lookup(self, strategies):
+        for strategy in TypeLibraryStrategy:
+            assert strategies.lookup(strategy.value) == strategy
+            assert strategies.lookup(strategy.value.upper()) == strategy
+            assert strategies.lookup(strategy.value.lower()) == strategy
+        with pytest.raises(LibraryStrategyNotRecognizedException):
+            strategies.lookup("this-is-not-a-strategy")
+
+    def test_add_alias(self, strategies):
+        assert "Whole Genome" not in strategies
+        strategies.add_alias("Whole Genome", TypeLibraryStrategy.WGS)
+        strategies.add_alias("exome", TypeLibraryStrategy.WXS.value)
+        assert strategies.lookup("whole genome") == TypeLibraryStrategy.WGS
+        assert strategies.lookup("EXOME") == TypeLibraryStrategy.WXS
+        with pytest.raises(LibraryStrategyNotRecognizedException):
+            strategies.add_alias("something", "this-is-not-a-strategy")
+
+    def test_shared_vocabularies(self):
+        assert len(vocabulary.LIBRARY_STRATEGIES) == len(
+            {strategy.value.lower() for strategy in TypeLibraryStrategy}
+        )
+        assert (
+            vocabulary.ILLUMINA_MODELS.lookup("NovaSeq")
+            == TypeIlluminaModel.ILLUMINA_NOVA_SEQ_6000
+        )
@@ -1,6 +1,7 @@
 import pytest
 
 from snpseq_metadata.models.converter import *
+from snpseq_metadata.models.ngi_models import NGIFastqFile
 
 
 class TestConverter:
@@ -14,6 +15,106 @@ class TestConverter:
         with pytest.raises(NGIModelConversionException):
             assert Converter.lims_to_ngi(lims_model=None)
 
+    def test_converter_for(self):
+        assert Converter.converter_for("ngi", NGIResultFile) is ConvertResultFile
+        # subclasses of a registered model class are resolved via the base class
+        assert Converter.converter_for("ngi", NGIFastqFile) is ConvertResultFile
+        assert ("ngi", NGIFastqFile) in Converter._resolved_converters
+        # for model classes converted by several converters, the first registered is used
+        assert Converter.converter_for("lims", LIMSSample) is ConvertSampleDescriptor
+        assert (
+            Converter.converter_for("lims", LIMSSequencingContainer)
+            is ConvertExperimentSet
+        )
+        assert Converter.converter_for("lims", LIMSMetadataModel) is None
+        assert Converter.converter_for("ngi", type(None)) is None
+
+    def test_register(self, ngi_study_obj):
+        class NGIStudyRefSubclass(NGIStudyRef):
+            __slots__ = ()
+
+        ngi_obj = NGIStudyRefSubclass(project_id=ngi_study_obj.project_id)
+        assert Converter.converter_for("ngi", type(ngi_obj)) is ConvertStudyRef
+
+        class ConvertStudyRefSubclass(ConvertStudyRef):
+            ngi_model_class = NGIStudyRefSubclass
+
+        # a converter is not used until it has been registered
+        assert Converter.converter_for("ngi", type(ngi_obj)) is ConvertStudyRef
+        try:
+            Converter.register(ConvertStudyRefSubclass)
+            assert Converter.converter_for("ngi", type(ngi_obj)) is ConvertStudyRefSubclass
+            # the subclass does not declare its own lims_model_class
+            assert Converter.converter_for("lims", LIMSSample) is ConvertSampleDescriptor
+        finally:
+            del Converter._ngi_converters[NGIStudyRefSubclass]
+            Converter._resolved_converters.clear()
+
+    def test_register_fall_through(self, ngi_study_obj, sra_study_obj):
+        class NGIStudyRefSubclass(NGIStudyRef):
+            __slots__ = ()
+
+        class ConvertNothing(ConvertStudyRef):
+            ngi_model_class = NGIStudyRefSubclass
+
+            @classmethod
+            def ngi_to_sra(cls, ngi_model):
+                return None
+
+        ngi_obj = NGIStudyRefSubclass(project_id=ngi_study_obj.project_id)
+        try:
+            Converter.register(ConvertNothing)
+            assert Converter.converters_for("ngi", type(ngi_obj)) == (
+                ConvertNothing,
+                ConvertStudyRef,
+            )
+            # a converter not returning a model falls through to the next converter
+            assert Converter.ngi_to_sra(ngi_model=ngi_obj) == sra_study_obj
+        finally:
+            del Converter._ngi_converters[NGIStudyRefSubclass]
+            Converter._resolved_converters.clear()
+
+    def test_no_converter_found(self):
+        class UnregisteredModel(NGIMetadataModel):
+            __slots__ = ()
+
+        assert Converter.converters_for("ngi", UnregisteredModel) == ()
+        with pytest.raises(SRAModelConversionException) as ex:
+            Converter.ngi_to_sra(ngi_model=UnregisteredModel())
+        assert "no converter has been registered for UnregisteredModel" in str(ex.value)
+
+        with pytest.raises(NGIModelConversionException) as ex:
+            Converter.lims_to_ngi(lims_model=LIMSMetadataModel())
+        assert "no converter has been registered for LIMSMetadataModel" in str(ex.value)
+
+    def test_flyweight(self, ngi_study_obj, sra_study_obj):
+        # outside of a conversion, a new object is created each time
+        assert Converter.ngi_to_sra(ngi_study_obj) is not Converter.ngi_to_sra(
+            ngi_study_obj
+        )
+        # within a conversion, identical reference objects are shared
+        with Converter.flyweight_cache() as cache:
+            sra_obj = Converter.ngi_to_sra(ngi_study_obj)
+            assert sra_obj == sra_study_obj
+            assert Converter.ngi_to_sra(NGIStudyRef(ngi_study_obj.project_id)) is sra_obj
+            assert Converter.ngi_to_sra(NGIStudyRef("another-project")) is not sra_obj
+            with Converter.flyweight_cache() as nested_cache:
+                assert nested_cache is cache
+            assert len(cache) == 2
+        assert Converter.ngi_to_sra(ngi_study_obj) is not sra_obj
+
+    def test_flyweight_experiment_set(self, ngi_experiment_set_obj):
+        sra_experiment_set = Converter.ngi_to_sra(ngi_model=ngi_experiment_set_obj)
+        study_refs = {}
+        for ngi_experiment, sra_experiment in zip(
+            ngi_experiment_set_obj.experiments, sra_experiment_set.experiments
+        ):
+            project_id = ngi_experiment.project.project_id
+            assert (
+                study_refs.setdefault(project_id, sra_experiment.study_ref)
+                is sra_experiment.study_ref
+            )
+
 
 class TestConvertSampleDescriptor:
     def test_ngi_to_sra(self, ngi_sample_obj, sra_sample_obj):
@@ -0,0 +1,138 @@
+import io
+import json
+from dataclasses import dataclass, field
+from typing import Optional
+
+import pytest
+from xsdata.exceptions import ParserError
+from xsdata.formats.dataclass.context import XmlContext
+
+from snpseq_metadata.models.custom_json_parser import CustomJsonParser
+from snpseq_metadata.models.import_export import ModelExporter, ModelImporter
+from snpseq_metadata.models.sra_models import SRARunSet
+from snpseq_metadata.models.xsdata import (
+    PoolMemberType,
+    RefObjectType,
+    SampleDescriptorType,
+)
+
+
+@dataclass
+class IntValue:
+    value: Optional[int] = field(default=None, metadata={"type": "Element"})
+
+
+@dataclass
+class StrValue:
+    value: Optional[str] = field(default=None, metadata={"type": "Element"})
+
+
+@dataclass
+class OtherValue:
+    other: Optional[str] = field(default=None, metadata={"type": "Element"})
+
+
+class TestModelExporter:
+    def test_serializer(self):
+        serializer = ModelExporter.serializer(obj_entity="RUN", format="xml")
+        assert ModelExporter.serializer(obj_entity="RUN", format="xml") is serializer
+        assert (
+            ModelExporter.serializer(obj_entity="RUN", xml_declaration=False, format="xml")
+            is not serializer
+        )
+
+        # the serializers for the same element naming should share the context
+        json_serializer = ModelExporter.serializer(obj_entity="RUN", format="json")
+        assert json_serializer is not serializer
+        assert json_serializer.context is serializer.context
+        assert (
+            ModelExporter.serializer(obj_entity="EXPERIMENT", format="xml").context
+            is not serializer.context
+        )
+
+    def test_repeated_export(self, sra_sequencing_run_obj):
+        # repeated exports with the cached serializers should render identically
+        assert sra_sequencing_run_obj.to_xml() == sra_sequencing_run_obj.to_xml()
+        assert sra_sequencing_run_obj.to_json() == sra_sequencing_run_obj.to_json()
+
+    def test_to_json(self, sra_sequencing_run_obj, sra_sequencing_run_json):
+        serializer = ModelExporter.serializer(
+            obj_entity=sra_sequencing_run_obj.model_entity,
+            meta_name=sra_sequencing_run_obj.model_meta_name,
+            format="json",
+        )
+        # the dict should be the same as when rendering and parsing the json
+        observed_json = sra_sequencing_run_obj.to_json()
+        assert observed_json == json.loads(
+            serializer.render(sra_sequencing_run_obj.model_object)
+        )
+        assert observed_json == sra_sequencing_run_json
+
+    def test_write_json(self, sra_sequencing_run_obj):
+        fh = io.StringIO()
+        sra_sequencing_run_obj.write_json(fh)
+        assert fh.getvalue() == json.dumps(sra_sequencing_run_obj.to_json(), indent=2)
+
+    def test_write_xml(self, sra_sequencing_run_obj, sra_experiment_set_obj):
+        sra_run_set = SRARunSet.create_object(runs=[sra_sequencing_run_obj] * 3)
+        for sra_obj in [sra_run_set, sra_experiment_set_obj, sra_sequencing_run_obj]:
+            for xml_declaration in [True, False]:
+                fh = io.StringIO()
+                sra_obj.write_xml(fh, xml_declaration=xml_declaration)
+                assert fh.getvalue() == sra_obj.to_xml(xml_declaration=xml_declaration)
+
+        # an empty set should be written as a whole
+        fh = io.StringIO()
+        SRARunSet.create_object(runs=[]).write_xml(fh)
+        assert fh.getvalue() == SRARunSet.create_object(runs=[]).to_xml()
+
+
+class TestModelImporter:
+    def test_from_json(self, sra_sequencing_run_obj, sra_sequencing_run_json, capsys):
+        model_object = ModelImporter.from_json(
+            json_obj=sra_sequencing_run_json,
+            model_cls=type(sra_sequencing_run_obj.model_object),
+        )
+        assert model_object == sra_sequencing_run_obj.model_object
+        # the same parser should be re-used and nothing should be written to stdout
+        assert ModelImporter.parser() is ModelImporter.parser()
+        assert capsys.readouterr().out == ""
+
+    def test_candidate_classes(self, sra_experiment_ref_json):
+        parser = ModelImporter.parser()
+        classes = frozenset([RefObjectType, SampleDescriptorType, PoolMemberType])
+        keys = frozenset(sra_experiment_ref_json.keys())
+        candidates = parser.candidate_classes(classes, keys)
+        assert [clazz for clazz, _ in candidates] == sorted(
+            [clazz for clazz in classes if parser.context.local_names_match(keys, clazz)],
+            key=lambda clazz: clazz.__name__,
+        )
+        assert parser.candidate_classes(classes, keys) is candidates
+
+    def test_bind_best_dataclass_values(self):
+        parser = CustomJsonParser(context=XmlContext())
+        classes = [IntValue, StrValue]
+        # data with the same shape resolve to different classes depending on the values
+        assert parser.bind_best_dataclass({"value": "abc"}, classes) == StrValue(
+            value="abc"
+        )
+        assert parser.bind_best_dataclass({"value": "12"}, classes) == IntValue(
+            value=12
+        )
+        assert parser.bind_best_dataclass({"value": "abc"}, classes) == StrValue(
+            value="abc"
+        )
+
+    def test_bind_best_dataclass_repeated(self):
+        parser = CustomJsonParser(context=XmlContext())
+        # repeated data should be bound identically, using the cached candidates
+        for i in range(3):
+            assert parser.bind_best_dataclass(
+                {"value": str(i)}, [IntValue, OtherValue]
+            ) == IntValue(value=i)
+        assert len(parser.candidate_cache) == 1
+
+        # data that cannot be bound should fail every time
+        for _ in range(2):
+            with pytest.raises(ParserError):
+                parser.bind_best_dataclass({"IDENTIFIERS": None}, [RefObjectType])
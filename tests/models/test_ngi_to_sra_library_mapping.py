@@ -1,3 +1,5 @@
+import gc
+
 from snpseq_metadata.models.ngi_to_sra_library_mapping import (
     ApplicationSampleTypeMapping,
     UnspecifiedLibrary,
@@ -58,3 +60,41 @@ class TestApplicationSampleTypeMapping:
             sample_type="total rna",
             sample_prep_kit="truseq stranded mrna sample preparation kit ht",
         )
+
+    def test_create_object_new_subclass(self):
+        mapping = {
+            "application": "this-is-a-new-application",
+            "sample_type": "this-is-a-new-sample-type",
+            "sample_prep_kit": "this-is-a-new-sample-prep-kit",
+        }
+        self._create_object_helper(UnspecifiedLibrary, **mapping)
+
+        # defining a new subclass should make the lookup pick it up
+        class NewApplication(ApplicationSampleTypeMapping):
+            ngi_application = mapping["application"]
+            ngi_sample_type = mapping["sample_type"]
+            ngi_sample_prep_kit = [mapping["sample_prep_kit"]]
+
+        self._create_object_helper(
+            NewApplication, **{k: v.upper() for k, v in mapping.items()}
+        )
+
+        # drop the subclass and the lookup caches referring to it, so that it does not leak
+        # into other tests, and assert that the lookup no longer picks it up
+        del NewApplication
+        ApplicationSampleTypeMapping._lookup_tables.clear()
+        ApplicationSampleTypeMapping._resolve.cache_clear()
+        gc.collect()
+        self._create_object_helper(UnspecifiedLibrary, **mapping)
+
+    def test_create_object_case_sensitive_class_values(self):
+        """
+        values on the mapping classes are expected to be in lower case, an upper case value will
+        not be matched
+        """
+        self._create_object_helper(
+            UnspecifiedLibrary,
+            application="single-cell",
+            sample_type="cells/nuclei",
+            sample_prep_kit="Chromium single cell 3’ Library prep",
+        )
@@ -1,8 +1,13 @@
+import json
+import os
+
 import pytest
+from click.testing import CliRunner
 
 from snpseq_metadata.models.ngi_models import NGIFlowcell
 from snpseq_metadata.models.sra_models import SRARunSet
 from snpseq_metadata.models.converter import Converter
+from snpseq_metadata.scripts.metadata import metadata, expand_runfolder_paths
 
 from tests.models.conftest import ignore_xml_namespace_attributes
 
@@ -35,12 +40,60 @@ class TestNGIFlowcell:
     def test_to_json(self, ngi_flowcell_from_disk, runfolder_ngi_json):
         assert ngi_flowcell_from_disk.to_json() == runfolder_ngi_json
 
+    def test_parse_flowcell_from_disk_concurrently(
+        self, ngi_flowcell_from_disk, runfolder_path
+    ):
+        assert (
+            NGIFlowcell(runfolder_path=runfolder_path, concurrency=4)
+            == ngi_flowcell_from_disk
+        )
+
     def test_from_json(self, ngi_flowcell_from_disk, runfolder_ngi_json):
         assert (
             NGIFlowcell.from_json(json_obj=runfolder_ngi_json) == ngi_flowcell_from_disk
         )
 
 
+class TestExtractRunfolders:
+    def test_expand_runfolder_paths(self, runfolder_path, tmp_path):
+        runfolder_list = [
+            "# a comment\n",
+            "\n",
+            f"{runfolder_path}\n",
+            "/path/to/another_runfolder\n",
+        ]
+        pattern = os.path.join(os.path.dirname(runfolder_path), "*_A00001_*")
+        assert expand_runfolder_paths(
+            runfolder_patterns=[pattern], runfolder_list=runfolder_list
+        ) == [os.path.normpath(runfolder_path), "/path/to/another_runfolder"]
+
+    def test_extract_runfolders(self, runfolder_path, ngi_flowcell_from_disk, tmp_path):
+        missing_runfolder = os.path.join(str(tmp_path), "missing_runfolder")
+        result = CliRunner().invoke(
+            metadata,
+            [
+                "extract",
+                "runfolders",
+                "-o",
+                str(tmp_path),
+                "-r",
+                runfolder_path,
+                "-r",
+                missing_runfolder,
+                "--runfolder-workers",
+                "2",
+                "json",
+            ],
+        )
+        assert result.exit_code != 0
+        assert f"OK\t{os.path.normpath(runfolder_path)}" in result.output
+        assert f"FAILED\t{missing_runfolder}" in result.output
+        with open(
+            os.path.join(str(tmp_path), f"{ngi_flowcell_from_disk.runfolder_name}.ngi.json")
+        ) as fh:
+            assert NGIFlowcell.from_json(json_obj=json.load(fh)) == ngi_flowcell_from_disk
+
+
 class TestSRAFlowcell:
     def test_convert_flowcell_to_run_set(self, sra_run_set_from_ngi_flowcell):
         assert type(sra_run_set_from_ngi_flowcell) is SRARunSet
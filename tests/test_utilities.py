@@ -1,3 +1,4 @@
+import hashlib
 import os
 import pytest
 
@@ -15,6 +16,39 @@ def test_calculate_checksum_from_file(file_checksums):
         )
 
 
+def test_calculate_checksum_from_file_buffer_size(file_checksums):
+    # assert that the checksum does not depend on the size of the read buffer
+    for testfile, checksum in file_checksums.items():
+        for buffer_size in [1, 7, 64, 1024 * 1024]:
+            assert (
+                snpseq_metadata.utilities.calculate_checksum_from_file(
+                    queryfile=testfile,
+                    method=testfile.split(".")[-1].upper(),
+                    buffer_size=buffer_size,
+                )
+                == checksum
+            )
+
+
+def test_calculate_checksums_from_file(file_checksums):
+    for testfile in file_checksums.keys():
+        with open(testfile, "rb") as fh:
+            data = fh.read()
+        assert snpseq_metadata.utilities.calculate_checksums_from_file(
+            queryfile=testfile, methods=["MD5", "SHA256", "sha1"], buffer_size=16
+        ) == {
+            "MD5": hashlib.md5(data).hexdigest(),
+            "SHA256": hashlib.sha256(data).hexdigest(),
+            "sha1": hashlib.sha1(data).hexdigest(),
+        }
+
+    for buffer_size in [0, -1]:
+        with pytest.raises(ValueError):
+            snpseq_metadata.utilities.calculate_checksums_from_file(
+                queryfile=testfile, methods=["MD5"], buffer_size=buffer_size
+            )
+
+
 def test_parse_samplesheet_data(samplesheet_file, samplesheet_data):
     assert (
         snpseq_metadata.utilities.parse_samplesheet_data(samplesheet_file)
@@ -65,6 +99,51 @@ def test_find_existing_samplesheet(test_resources_path, samplesheet_file):
     ]
 
 
+def test_find_samplesheet_directory_index(test_resources_path, samplesheet_file):
+    # assert that the directory is only listed once when using a directory index
+    directory_index = snpseq_metadata.utilities.DirectoryIndex()
+    for _ in range(2):
+        assert snpseq_metadata.utilities.find_samplesheet(
+            test_resources_path, directory_index=directory_index
+        ) == [os.path.basename(samplesheet_file)]
+    assert directory_index.syscalls == 1
+
+
+class TestDirectoryIndex:
+    def test_scan(self, tmpdir, monkeypatch):
+        for d in ["dir-1", "dir-2"]:
+            os.makedirs(os.path.join(tmpdir, d))
+        for f in ["file-1", os.path.join("dir-1", "file-2")]:
+            open(os.path.join(tmpdir, f), "w").close()
+
+        directory_index = snpseq_metadata.utilities.DirectoryIndex()
+        assert directory_index.scan(tmpdir) == {
+            "dir-1": True,
+            "dir-2": True,
+            "file-1": False,
+        }
+        assert sorted(directory_index.subdirs(tmpdir)) == ["dir-1", "dir-2"]
+        assert directory_index.listdir(os.path.join(tmpdir, "dir-1")) == ["file-2"]
+        assert directory_index.syscalls == 2
+
+        # assert that listings are served from the index after the first scan
+        def _scandir(*args, **kwargs):
+            raise AssertionError("os.scandir should not be called")
+
+        monkeypatch.setattr(os, "scandir", _scandir)
+        assert sorted(directory_index.listdir(os.path.join(tmpdir, ".", "dir-2", ".."))) == [
+            "dir-1",
+            "dir-2",
+            "file-1",
+        ]
+        assert directory_index.syscalls == 2
+
+        # a missing directory raises an exception
+        monkeypatch.undo()
+        with pytest.raises(OSError):
+            directory_index.scan(os.path.join(tmpdir, "this-does-not-exist"))
+
+
 def test_lookup_checksum_from_file(test_resources_path, checksum_file, file_checksums):
 
     # if a checksum file is missing, the method will throw an exception
@@ -82,3 +161,108 @@ def test_lookup_checksum_from_file(test_resources_path, checksum_file, file_chec
             )
             == expected_checksum
         )
+
+
+class TestChecksumIndex:
+    def test_from_file(self, test_resources_path, checksum_file, file_checksums):
+        checksum_index = snpseq_metadata.utilities.ChecksumIndex.from_file(
+            checksumfile=checksum_file
+        )
+        for testfile, expected_checksum in file_checksums.items():
+            querypath = os.path.relpath(testfile, os.path.dirname(test_resources_path))
+            assert (
+                checksum_index.lookup(querypath=querypath, method="MD5")
+                == expected_checksum
+            )
+            # paths should be normalized before lookup
+            assert (
+                checksum_index.lookup(
+                    querypath=os.path.join(".", querypath), method="md5"
+                )
+                == expected_checksum
+            )
+            assert checksum_index.lookup(querypath=querypath, method="SHA256") is None
+
+    def test_from_file_missing(self):
+        with pytest.raises(OSError):
+            snpseq_metadata.utilities.ChecksumIndex.from_file(
+                checksumfile="this-file-does-not-exist"
+            )
+
+    def test_from_file_formats(self, tmpdir, monkeypatch):
+        md5 = "e307896d4855a2df172037be41574c16"
+        sha256 = "a" * 64
+        checksumfile = os.path.join(tmpdir, "checksums")
+        with open(checksumfile, "w") as fh:
+            fh.write(f"{md5}  runfolder/file-1.fastq.gz\n")
+            fh.write(f"{md5} *runfolder/file-2.fastq.gz\n")
+            fh.write(f"{sha256}  ./runfolder/file-1.fastq.gz\n")
+            fh.write(f"MD5 (runfolder/file 3.fastq.gz) = {md5}\n")
+            fh.write(f"SHA256 (runfolder/file 3.fastq.gz) = {sha256}\n")
+            fh.write(f"\\{md5}  runfolder/file\\n4.fastq.gz\n")
+            fh.write("\n# this is a comment\nthis-is-not-a-checksum\n")
+
+        expected = [
+            ("runfolder/file-1.fastq.gz", "MD5", md5),
+            ("runfolder/file-1.fastq.gz", "SHA-256", sha256),
+            ("runfolder/file-2.fastq.gz", "MD5", md5),
+            ("runfolder/file 3.fastq.gz", "MD5", md5),
+            ("runfolder/file 3.fastq.gz", "SHA256", sha256),
+            ("runfolder/file\n4.fastq.gz", "MD5", md5),
+        ]
+        # parse the file both with and without memory-mapping it
+        for mmap_threshold in [1024, 0]:
+            monkeypatch.setattr(
+                snpseq_metadata.utilities.ChecksumIndex, "mmap_threshold", mmap_threshold
+            )
+            checksum_index = snpseq_metadata.utilities.ChecksumIndex.from_file(
+                checksumfile=checksumfile
+            )
+            assert len(checksum_index) == 4
+            for querypath, method, checksum in expected:
+                assert checksum_index.lookup(querypath=querypath, method=method) == checksum
+
+
+class TestChecksumCache:
+    def test_get_put(self, tmpdir):
+        queryfile = os.path.join(tmpdir, "file.fastq.gz")
+        with open(queryfile, "w") as fh:
+            fh.write("this-is-some-data")
+
+        with snpseq_metadata.utilities.ChecksumCache.in_directory(
+            os.path.join(tmpdir, "cache")
+        ) as checksum_cache:
+            assert checksum_cache.get(queryfile=queryfile, method="MD5") is None
+            checksum_cache.put(queryfile=queryfile, method="MD5", checksum="checksum")
+            assert checksum_cache.get(queryfile=queryfile, method="MD5") == "checksum"
+            assert checksum_cache.get(queryfile=queryfile, method="SHA256") is None
+            # a missing file should not be found in the cache
+            assert checksum_cache.get(queryfile=f"{queryfile}.missing", method="MD5") is None
+
+        # assert that the cache is persisted between instances
+        with snpseq_metadata.utilities.ChecksumCache.in_directory(
+            os.path.join(tmpdir, "cache")
+        ) as checksum_cache:
+            assert checksum_cache.get(queryfile=queryfile, method="MD5") == "checksum"
+
+            # assert that a modified file is not found in the cache
+            with open(queryfile, "a") as fh:
+                fh.write("this-is-some-more-data")
+            assert checksum_cache.get(queryfile=queryfile, method="MD5") is None
+
+    def test_put_stale_stat(self, tmpdir):
+        queryfile = os.path.join(tmpdir, "file.fastq.gz")
+        with open(queryfile, "w") as fh:
+            fh.write("this-is-some-data")
+
+        with snpseq_metadata.utilities.ChecksumCache.in_directory(
+            os.path.join(tmpdir, "cache")
+        ) as checksum_cache:
+            # assert that a file modified after being stat'ed is stored under the stale key
+            stat = os.stat(queryfile)
+            with open(queryfile, "a") as fh:
+                fh.write("this-is-some-more-data")
+            checksum_cache.put(
+                queryfile=queryfile, method="MD5", checksum="checksum", stat=stat
+            )
+            assert checksum_cache.get(queryfile=queryfile, method="MD5") is None
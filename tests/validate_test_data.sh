@@ -5,8 +5,9 @@ ROOTPATH="$1"
 OUTPATH="$2"
 OUTTEST="$OUTPATH/test_data"
 
-mkdir -p "$OUTTEST"
+mkdir -p "$OUTTEST" "$OUTPATH/batch"
 snpseq_metadata extract runfolder -o "$OUTPATH" "$ROOTPATH/tests/resources/210415_A00001_0123_BXYZ321XY" json
+snpseq_metadata extract runfolders -o "$OUTPATH/batch" -r "$ROOTPATH/tests/resources/*_A00001_*" json
 snpseq_metadata extract snpseq-data -o "$OUTPATH" "$ROOTPATH/tests/resources/snpseq_data_XYZ321XY.json" json
 snpseq_metadata export -o "$OUTPATH" "$OUTPATH/210415_A00001_0123_BXYZ321XY.ngi.json" "$OUTPATH/snpseq_data_XYZ321XY.ngi.json" json xml manifest
 snpseq_metadata export -o "$OUTTEST" "$ROOTPATH/tests/resources/210415_A00001_0123_BXYZ321XY.ngi.json" "$ROOTPATH/tests/resources/snpseq_data_XYZ321XY.ngi.json" json xml manifest